@@ -1,104 +1,193 @@
+import collections
+import hashlib
 import random
+import struct
+import sys
+import threading
+import time
 
-def extended_gcd(a, b):
-    if a == 0:
-        return b, 0, 1
-    
-    g, x1, y1 = extended_gcd(b % a, a)
-    
-    x = y1 - (b // a) * x1
-    y = x1
-    return g, x, y
+import numpy as np
+
+import numtheory
+from euclidean import batch_mod_inverse
+from numtheory import FixedBaseTable, context_for, is_probable_prime
 
 def mod_inverse(a, m):
     a = a % m 
     if a == 0:
         return None 
-        
-    g, x, y = extended_gcd(a, m)
-    
-    if g != 1:
-        raise ValueError(f"Modular inverse does not exist: gcd({a}, {m}) = {g}")
-    else:
-        return x % m
-
-def mod_pow(base, exp, mod):
-    result = 1
-    base %= mod
-    while exp > 0:
-        if exp % 2 == 1:
-            result = (result * base) % mod
-        exp = exp >> 1
-        base = (base * base) % mod
-    return result
+    return numtheory.mod_inverse(a, m)
 
 def left_rotate(n, b):
     return ((n << b) | (n >> (32 - b))) & 0xFFFFFFFF
 
+SHA1_INIT = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0)
+SHA1_CHUNK_SIZE = 1 << 16  # bytes read per call when hashing a file object
+
+_SCHEDULE = struct.Struct('>16I')
+
+def _sha1_compress(h, data, offset, w):
+    """Runs the SHA-1 compression function on the 64-byte block at data[offset] into state h.
+
+    w is a caller-owned 80-word buffer reused for the message schedule.
+    """
+    w[0:16] = _SCHEDULE.unpack_from(data, offset)
+    for j in range(16, 80):
+        x = w[j-3] ^ w[j-8] ^ w[j-14] ^ w[j-16]
+        w[j] = ((x << 1) | (x >> 31)) & 0xFFFFFFFF
+
+    a, b, c, d, e = h
+
+    for j in range(0, 20):
+        temp = ((((a << 5) | (a >> 27)) & 0xFFFFFFFF) + ((b & c) | (~b & d)) + e + 0x5A827999 + w[j]) & 0xFFFFFFFF
+        e, d, c, b, a = d, c, ((b << 30) | (b >> 2)) & 0xFFFFFFFF, a, temp
+    for j in range(20, 40):
+        temp = ((((a << 5) | (a >> 27)) & 0xFFFFFFFF) + (b ^ c ^ d) + e + 0x6ED9EBA1 + w[j]) & 0xFFFFFFFF
+        e, d, c, b, a = d, c, ((b << 30) | (b >> 2)) & 0xFFFFFFFF, a, temp
+    for j in range(40, 60):
+        temp = ((((a << 5) | (a >> 27)) & 0xFFFFFFFF) + ((b & c) | (b & d) | (c & d)) + e + 0x8F1BBCDC + w[j]) & 0xFFFFFFFF
+        e, d, c, b, a = d, c, ((b << 30) | (b >> 2)) & 0xFFFFFFFF, a, temp
+    for j in range(60, 80):
+        temp = ((((a << 5) | (a >> 27)) & 0xFFFFFFFF) + (b ^ c ^ d) + e + 0xCA62C1D6 + w[j]) & 0xFFFFFFFF
+        e, d, c, b, a = d, c, ((b << 30) | (b >> 2)) & 0xFFFFFFFF, a, temp
+
+    h[0] = (h[0] + a) & 0xFFFFFFFF
+    h[1] = (h[1] + b) & 0xFFFFFFFF
+    h[2] = (h[2] + c) & 0xFFFFFFFF
+    h[3] = (h[3] + d) & 0xFFFFFFFF
+    h[4] = (h[4] + e) & 0xFFFFFFFF
+
+
+class SHA1:
+    """Incremental SHA-1 with the hashlib interface (update, digest, hexdigest, copy)."""
+
+    name = 'sha1'
+    digest_size = 20
+    block_size = 64
+
+    def __init__(self, data=b''):
+        self._h = list(SHA1_INIT)
+        self._w = [0] * 80
+        self._buffer = bytearray()
+        self._length = 0
+        if data:
+            self.update(data)
+
+    def update(self, data):
+        if isinstance(data, str):
+            raise TypeError("Strings must be encoded before hashing")
+        view = memoryview(data).cast('B')
+        self._length += len(view)
+        h, w = self._h, self._w
+
+        offset = 0
+        if self._buffer:
+            offset = min(64 - len(self._buffer), len(view))
+            self._buffer += view[:offset]
+            if len(self._buffer) < 64:
+                return
+            _sha1_compress(h, self._buffer, 0, w)
+            self._buffer.clear()
+
+        end = len(view) - (len(view) - offset) % 64
+        for pos in range(offset, end, 64):
+            _sha1_compress(h, view, pos, w)
+        self._buffer += view[end:]
+
+    def copy(self):
+        other = SHA1.__new__(SHA1)
+        other._h = list(self._h)
+        other._w = [0] * 80
+        other._buffer = bytearray(self._buffer)
+        other._length = self._length
+        return other
+
+    def digest(self):
+        h = list(self._h)
+        tail = self._buffer + b'\x80' + bytes((55 - len(self._buffer)) % 64) + (self._length * 8).to_bytes(8, 'big')
+        for pos in range(0, len(tail), 64):
+            _sha1_compress(h, tail, pos, self._w)
+        return struct.pack('>5I', *h)
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+
+def sha1_update_from(hasher, message):
+    """Feeds a str (UTF-8), bytes-like object or binary file object into hasher, in constant memory."""
+    if isinstance(message, str):
+        hasher.update(message.encode('utf-8'))
+    elif hasattr(message, 'read'):
+        while True:
+            chunk = message.read(SHA1_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    else:
+        hasher.update(message)
+    return hasher
+
 def sha1(message):
-    h0 = 0x67452301
-    h1 = 0xEFCDAB89
-    h2 = 0x98BADCFE
-    h3 = 0x10325476
-    h4 = 0xC3D2E1F0
-    
-    message_bytes = message.encode('utf-8')
-    bit_len = len(message_bytes) * 8
-    
-    message_bytes += b'\x80'
-    while len(message_bytes) % 64 != 56:
-        message_bytes += b'\x00'
-    message_bytes += bit_len.to_bytes(8, 'big')
-    
-    for i in range(0, len(message_bytes), 64):
-        w = [0] * 80
-        chunk = message_bytes[i:i+64]
-        
-        for j in range(16):
-            w[j] = int.from_bytes(chunk[j*4:(j+1)*4], 'big')
-        
+    """Full 160-bit SHA-1 digest of message (str, bytes-like or binary file object) as an integer."""
+    return int.from_bytes(sha1_update_from(SHA1(), message).digest(), 'big')
+
+def _sha1_pad(message):
+    return message + b'\x80' + bytes((55 - len(message)) % 64) + (len(message) * 8).to_bytes(8, 'big')
+
+def _rotl_np(x, n):
+    return (x << np.uint32(n)) | (x >> np.uint32(32 - n))
+
+def _sha1_lockstep(blocks):
+    """SHA-1 over G equally long padded messages given as a (G, nblocks, 16) uint32 array."""
+    count = blocks.shape[0]
+    h = [np.full(count, v, dtype=np.uint32) for v in SHA1_INIT]
+    w = np.empty((80, count), dtype=np.uint32)
+    k1, k2, k3, k4 = np.uint32(0x5A827999), np.uint32(0x6ED9EBA1), np.uint32(0x8F1BBCDC), np.uint32(0xCA62C1D6)
+
+    for blk in range(blocks.shape[1]):
+        w[:16] = blocks[:, blk, :].T
         for j in range(16, 80):
-            w[j] = (left_rotate((w[j-3] ^ w[j-8] ^ w[j-14] ^ w[j-16]), 1)) & 0xFFFFFFFF
-        
-        a = h0
-        b = h1
-        c = h2
-        d = h3
-        e = h4
-        
+            w[j] = _rotl_np(w[j-3] ^ w[j-8] ^ w[j-14] ^ w[j-16], 1)
+
+        a, b, c, d, e = h
         for j in range(80):
-            if 0 <= j <= 19:
-                f = (b & c) | ((~b) & d)
-                k = 0x5A827999
-            elif 20 <= j <= 39:
-                f = b ^ c ^ d
-                k = 0x6ED9EBA1
-            elif 40 <= j <= 59:
-                f = (b & c) | (b & d) | (c & d)
-                k = 0x8F1BBCDC
+            if j < 20:
+                f, k = (b & c) | (~b & d), k1
+            elif j < 40:
+                f, k = b ^ c ^ d, k2
+            elif j < 60:
+                f, k = (b & c) | (b & d) | (c & d), k3
             else:
-                f = b ^ c ^ d
-                k = 0xCA62C1D6
-            
-            temp = (left_rotate(a, 5) + f + e + k + w[j]) & 0xFFFFFFFF
-            
-            e = d
-            d = c
-            c = left_rotate(b, 30)
-            b = a
-            a = temp
-            
-        h0 = (h0 + a) & 0xFFFFFFFF
-        h1 = (h1 + b) & 0xFFFFFFFF
-        h2 = (h2 + c) & 0xFFFFFFFF
-        h3 = (h3 + d) & 0xFFFFFFFF
-        h4 = (h4 + e) & 0xFFFFFFFF
-        
-    return h0
+                f, k = b ^ c ^ d, k4
+            temp = _rotl_np(a, 5) + f + e + k + w[j]
+            e, d, c, b, a = d, c, _rotl_np(b, 30), a, temp
+        h = [h[0] + a, h[1] + b, h[2] + c, h[3] + d, h[4] + e]
+
+    return np.stack(h, axis=1).astype('>u4')
+
+def sha1_batch(messages):
+    """SHA-1 digests (20-byte bytes, same as hashlib.sha1) of many messages, hashed in lockstep.
+
+    Messages are grouped by padded block count and every group runs the 80 rounds as NumPy
+    uint32 vector operations across all of its members at once.
+    """
+    padded = [_sha1_pad(m.encode('utf-8') if isinstance(m, str) else bytes(m)) for m in messages]
+    groups = {}
+    for i, p in enumerate(padded):
+        groups.setdefault(len(p) // 64, []).append(i)
+
+    digests = [None] * len(padded)
+    for nblocks, members in groups.items():
+        data = np.frombuffer(b"".join(padded[i] for i in members), dtype='>u4')
+        out = _sha1_lockstep(data.astype(np.uint32).reshape(len(members), nblocks, 16))
+        raw = out.tobytes()
+        for row, i in enumerate(members):
+            digests[i] = raw[20 * row:20 * row + 20]
+    return digests
 
 def generate_dsa_keys(p, q, g):
     x = random.randint(1, q-1)
-    y = mod_pow(g, x, p)
+    y = context_for(p).pow(g, x)
     
     return (x), (p, q, g, y) 
 
@@ -107,7 +196,7 @@ def sign_message(message, private_key_x, p, q, g):
     
     k = random.randint(1, q-1)
     
-    r = (mod_pow(g, k, p)) % q
+    r = (context_for(p).pow(g, k)) % q
     
     if r == 0:
         return sign_message(message, private_key_x, p, q, g)
@@ -135,13 +224,360 @@ def verify_signature(message, signature, public_key_params):
     u1 = (h * s_inv) % q
     u2 = (r * s_inv) % q
     
-    g_u1 = mod_pow(g, u1, p)
-    y_u2 = mod_pow(y, u2, p)
-    
-    v = ((g_u1 * y_u2) % p) % q
+    # g^u1 * y^u2 in one simultaneous exponentiation
+    v = context_for(p).multi_pow(((g, u1), (y, u2))) % q
     
     return v == r
 
+# --- Fixed-base tables and multi-exponentiation ---
+
+def generate_dsa_params(L, N):
+    """Generates DSA domain parameters (p, q, g) with an L-bit p and an N-bit q dividing p - 1."""
+    while True:
+        q = random.getrandbits(N) | (1 << (N - 1)) | 1
+        if is_probable_prime(q):
+            break
+    while True:
+        p = random.getrandbits(L) | (1 << (L - 1))
+        p -= (p - 1) % q
+        if p.bit_length() == L and is_probable_prime(p):
+            break
+    h = 2
+    while True:
+        g = pow(h, (p - 1) // q, p)
+        if g > 1:
+            return p, q, g
+        h += 1
+
+
+def multi_pow(pairs, mod, window=4):
+    """Computes the product of base^exp mod mod over (base, exp) pairs with Straus's method.
+
+    All exponents share one chain of squarings; each base only contributes one multiplication
+    per window-bit digit from its small table of powers.
+    """
+    return context_for(mod).multi_pow(pairs, window)
+
+
+class DSADomain:
+    """DSA under fixed (p, q, g) with a precomputed table for g and optional per-key tables for y.
+
+    Signatures are interchangeable with sign_message / verify_signature. Per-key tables are kept
+    in an LRU of key_table_cache entries (each is about 680 KB for a 2048-bit p at window 6).
+    """
+
+    def __init__(self, p, q, g, window=8, key_window=6, key_table_cache=16):
+        self.p, self.q, self.g = p, q, g
+        self.key_window = key_window
+        self.g_table = FixedBaseTable(g, p, q.bit_length(), window)
+        self.key_table_cache = key_table_cache
+        self.key_tables = collections.OrderedDict()
+
+    def generate_keys(self):
+        x = random.randint(1, self.q - 1)
+        return x, self.g_table.pow(x)
+
+    def precompute_public_key(self, y):
+        """Builds and caches a fixed-base table for public key y (worth it when y verifies often)."""
+        table = self.key_tables.get(y)
+        if table is None:
+            table = self.key_tables[y] = FixedBaseTable(y, self.p, self.q.bit_length(), self.key_window)
+            while len(self.key_tables) > self.key_table_cache:
+                self.key_tables.popitem(last=False)
+        self.key_tables.move_to_end(y)
+        return table
+
+    def key_table_threshold(self):
+        """Verifications of one key in a batch that pay for building its table.
+
+        A table costs rows * 2^key_window multiplications to build, and each verification
+        through it saves roughly q.bit_length() of them over Straus; the 1.25 margin covers
+        the table's memory traffic (about 14 at 2048/224 with window 6).
+        """
+        bits, w = self.q.bit_length(), self.key_window
+        rows = (bits + w - 1) // w
+        return max(2, -(-5 * rows * (1 << w) // (4 * bits)))
+
+    def sign(self, message, private_key_x):
+        q = self.q
+        h = sha1(message) % q
+        while True:
+            k = random.randint(1, q - 1)
+            r = self.g_table.pow(k) % q
+            if r == 0:
+                continue
+            s = pow(k, -1, q) * (h + private_key_x * r) % q
+            if s != 0:
+                return r, s
+
+    def verify(self, message, signature, y):
+        p, q = self.p, self.q
+        r, s = signature
+        if not (0 < r < q and 0 < s < q):
+            return False
+        h = sha1(message) % q
+        s_inv = pow(s, -1, q)
+        u1 = h * s_inv % q
+        u2 = r * s_inv % q
+
+        y_table = self.key_tables.get(y)
+        if y_table is not None:
+            v = self.g_table.pow(u1) * y_table.pow(u2) % p
+        else:
+            v = multi_pow(((self.g, u1), (y, u2)), p)
+        return v % q == r
+
+    def verify_batch(self, items, key_table_threshold=None):
+        """Verifies many (message, signature, public_key_y) triples and returns a list of bools.
+
+        All s^-1 values come from one modular inversion (Montgomery's trick), messages are hashed
+        with sha1_batch, and every public key seen at least key_table_threshold times (default:
+        key_table_threshold()) gets a fixed-base table for this batch only; tables already cached
+        by precompute_public_key are reused.
+        """
+        p, q = self.p, self.q
+        results = [False] * len(items)
+        live = [i for i, (_, (r, s), _) in enumerate(items) if 0 < r < q and 0 < s < q]
+        if not live:
+            return results
+
+        messages = [items[i][0] for i in live]
+        if all(isinstance(m, (str, bytes, bytearray, memoryview)) for m in messages):
+            hashes = [int.from_bytes(d, 'big') % q for d in sha1_batch(messages)]
+        else:
+            hashes = [sha1(m) % q for m in messages]
+        s_invs = batch_mod_inverse([items[i][1][1] for i in live], q)
+
+        if key_table_threshold is None:
+            key_table_threshold = self.key_table_threshold()
+        counts = collections.Counter(items[i][2] for i in live)
+        tables = {}
+        for y, n in counts.items():
+            if y in self.key_tables:
+                tables[y] = self.precompute_public_key(y)
+            elif n >= key_table_threshold:
+                tables[y] = FixedBaseTable(y, p, q.bit_length(), self.key_window)
+
+        g, g_pow = self.g, self.g_table.pow
+        for i, h, s_inv in zip(live, hashes, s_invs):
+            _, (r, _), y = items[i]
+            u1 = h * s_inv % q
+            u2 = r * s_inv % q
+            y_table = tables.get(y)
+            if y_table is not None:
+                v = g_pow(u1) * y_table.pow(u2) % p
+            else:
+                v = multi_pow(((g, u1), (y, u2)), p)
+            results[i] = v % q == r
+        return results
+
+
+    def presign(self):
+        """Message-independent half of a signature: returns (k^-1 mod q, r)."""
+        q = self.q
+        while True:
+            k = random.randint(1, q - 1)
+            r = self.g_table.pow(k) % q
+            if r != 0:
+                return pow(k, -1, q), r
+
+
+class PresignatureSigner:
+    """Signs with a bounded pool of precomputed (k^-1, r) pairs kept topped up by a background thread.
+
+    With a warm pool a signature costs one hash and a few multiplications mod q. When the pool
+    runs dry, sign() computes a presignature inline and counts it as a miss.
+    """
+
+    def __init__(self, domain, private_key_x, high_water=256, low_water=64):
+        if not 0 <= low_water < high_water:
+            raise ValueError("Pool watermarks must satisfy 0 <= low_water < high_water.")
+        self.domain = domain
+        self.x = private_key_x
+        self.high_water = high_water
+        self.low_water = low_water
+        self.pool = collections.deque()
+        self.produced = 0
+        self.consumed = 0
+        self.misses = 0
+        self.refills = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    def start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._refill_loop, name="dsa-presign", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _refill_loop(self):
+        while True:
+            with self._cond:
+                while not self._stopping and len(self.pool) > self.low_water:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                self.refills += 1
+            while len(self.pool) < self.high_water and not self._stopping:
+                self.pool.append(self.domain.presign())
+                self.produced += 1
+
+    def fill(self):
+        """Synchronously tops the pool up to the high-water mark."""
+        while len(self.pool) < self.high_water:
+            self.pool.append(self.domain.presign())
+            self.produced += 1
+
+    def metrics(self):
+        return {
+            "depth": len(self.pool),
+            "produced": self.produced,
+            "consumed": self.consumed,
+            "misses": self.misses,
+            "refills": self.refills,
+        }
+
+    def sign(self, message):
+        q = self.domain.q
+        h = sha1(message) % q
+        while True:
+            try:
+                k_inv, r = self.pool.popleft()
+                self.consumed += 1
+            except IndexError:
+                k_inv, r = self.domain.presign()
+                self.misses += 1
+            if len(self.pool) <= self.low_water:
+                with self._cond:
+                    self._cond.notify()
+            s = k_inv * (h + self.x * r) % q
+            if s != 0:
+                return r, s
+
+
+# --- Benchmarks ---
+
+def benchmark_sha1_batch(sizes=(10, 100, 1000, 10000, 100000), scalar_limit=1000):
+    """Messages/sec of sha1_batch against the scalar sha1 (timed on at most scalar_limit messages)."""
+    print("\n--- Batch SHA-1 benchmark ---")
+    for n in sizes:
+        messages = [f"message number {i} ".encode() * (1 + i % 5) for i in range(n)]
+        start = time.perf_counter()
+        digests = sha1_batch(messages)
+        batch = n / (time.perf_counter() - start)
+        assert digests == [hashlib.sha1(m).digest() for m in messages]
+
+        sample = messages[:scalar_limit]
+        start = time.perf_counter()
+        for m in sample:
+            sha1(m)
+        scalar = len(sample) / (time.perf_counter() - start)
+        print(f"n = {n:>6d} : batch {batch:10.0f} msg/s, scalar {scalar:8.0f} msg/s ({batch / scalar:6.1f}x)")
+
+def benchmark_dsa_domain(sizes=((2048, 224), (3072, 256)), rounds=20):
+    """Signatures/sec and verifications/sec of DSADomain against sign_message / verify_signature."""
+    for L, N in sizes:
+        p, q, g = generate_dsa_params(L, N)
+        domain = DSADomain(p, q, g)
+        x, y = domain.generate_keys()
+        params = (p, q, g, y)
+        messages = [f"message {i}" for i in range(rounds)]
+
+        def rate(func):
+            start = time.perf_counter()
+            results = [func(m) for m in messages]
+            return rounds / (time.perf_counter() - start), results
+
+        base_sign, base_sigs = rate(lambda m: sign_message(m, x, p, q, g))
+        dom_sign, dom_sigs = rate(lambda m: domain.sign(m, x))
+        base_verify, ok1 = rate(lambda m: verify_signature(m, dom_sigs[messages.index(m)], params))
+        straus_verify, ok2 = rate(lambda m: domain.verify(m, base_sigs[messages.index(m)], y))
+        domain.precompute_public_key(y)
+        table_verify, ok3 = rate(lambda m: domain.verify(m, dom_sigs[messages.index(m)], y))
+        assert all(ok1) and all(ok2) and all(ok3)
+        assert not domain.verify("tampered", dom_sigs[0], y)
+
+        print(f"\n--- DSA benchmark (L={L}, N={N}) ---")
+        print(f"sign_message         : {base_sign:8.1f} sig/s")
+        print(f"DSADomain.sign       : {dom_sign:8.1f} sig/s  ({dom_sign / base_sign:5.1f}x)")
+        print(f"verify_signature     : {base_verify:8.1f} ver/s")
+        print(f"DSADomain.verify     : {straus_verify:8.1f} ver/s  ({straus_verify / base_verify:5.1f}x, Straus)")
+        print(f"  with y table       : {table_verify:8.1f} ver/s  ({table_verify / base_verify:5.1f}x)")
+
+def benchmark_dsa_batch(L=2048, N=224, count=200, keys=10):
+    """Batch verification against a loop over verify_signature, with a few corrupted items."""
+    p, q, g = generate_dsa_params(L, N)
+    domain = DSADomain(p, q, g)
+    keypairs = [domain.generate_keys() for _ in range(keys)]
+    items = []
+    for i in range(count):
+        x, y = keypairs[i % keys]
+        message = f"ingest record {i}"
+        items.append((message, domain.sign(message, x), y))
+    for i in range(0, count, 37):
+        message, (r, s), y = items[i]
+        items[i] = (message, (r, s % (q - 1) + 1), y)
+
+    start = time.perf_counter()
+    expected = [verify_signature(m, sig, (p, q, g, y)) for m, sig, y in items]
+    loop = time.perf_counter() - start
+
+    domain = DSADomain(p, q, g)
+    start = time.perf_counter()
+    results = domain.verify_batch(items)
+    batch = time.perf_counter() - start
+    assert results == expected and expected.count(False) == len(range(0, count, 37))
+
+    print(f"\n--- Batch DSA verification benchmark (L={L}, N={N}, {count} items, {keys} keys) ---")
+    print(f"verify_signature loop  : {count / loop:8.1f} ver/s")
+    print(f"DSADomain.verify_batch : {count / batch:8.1f} ver/s  ({loop / batch:5.1f}x, incl. key tables)")
+
+def benchmark_presign(L=2048, N=224, count=500):
+    """p50/p99 signing latency with and without a warm presignature pool."""
+    p, q, g = generate_dsa_params(L, N)
+    domain = DSADomain(p, q, g)
+    x, y = domain.generate_keys()
+    messages = [f"request {i}" for i in range(count)]
+
+    def latencies(sign):
+        out = []
+        for m in messages:
+            start = time.perf_counter()
+            sig = sign(m)
+            out.append(time.perf_counter() - start)
+            assert domain.verify(m, sig, y)
+        out.sort()
+        return out[len(out) // 2], out[min(len(out) - 1, int(len(out) * 0.99))]
+
+    print(f"\n--- Presignature pool benchmark (L={L}, N={N}, {count} signatures) ---")
+    base = latencies(lambda m: sign_message(m, x, p, q, g))
+    print(f"sign_message            : p50 {base[0] * 1e3:7.3f} ms, p99 {base[1] * 1e3:7.3f} ms")
+    plain = latencies(lambda m: domain.sign(m, x))
+    print(f"DSADomain.sign          : p50 {plain[0] * 1e3:7.3f} ms, p99 {plain[1] * 1e3:7.3f} ms")
+
+    signer = PresignatureSigner(domain, x, high_water=count, low_water=count // 4)
+    signer.fill()
+    with signer:
+        pooled = latencies(signer.sign)
+    print(f"PresignatureSigner.sign : p50 {pooled[0] * 1e3:7.3f} ms, p99 {pooled[1] * 1e3:7.3f} ms")
+    print(f"pool metrics            : {signer.metrics()}")
+
 if __name__ == "__main__":
     P_DEMO = 23
     Q_DEMO = 11
@@ -171,3 +607,9 @@ if __name__ == "__main__":
         print(f"ERROR: {e}. Please check your math parameters (p, q, g).")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
+
+    if "--bench" in sys.argv:
+        benchmark_sha1_batch()
+        benchmark_dsa_domain()
+        benchmark_dsa_batch()
+        benchmark_presign()
@@ -1,14 +1,17 @@
+import functools
+import os
+import sys
+import tempfile
+import time
+
 import numpy as np
 
+from numtheory import mod_inverse
+
 # ------------------ 1. Caesar Cipher ------------------ #
 def caesar_encrypt(text, key):
-    result = ""
-    for char in text.upper():
-        if char.isalpha():
-            result += chr((ord(char) - 65 + key) % 26 + 65)
-        else:
-            result += char
-    return result
+    return "".join(chr((ord(char) - 65 + key) % 26 + 65) if char.isalpha() else char
+                   for char in text.upper())
 
 def caesar_decrypt(cipher, key):
     return caesar_encrypt(cipher, -key)
@@ -59,6 +62,93 @@ def playfair_encrypt(text, key):
     return cipher
 
 
+_PLAYFAIR_NORMALIZE = str.maketrans("abcdefghijklmnopqrstuvwxyzJ", "ABCDEFGHIIKLMNOPQRSTUVWXYZI",
+                                    "".join(chr(c) for c in range(128) if not chr(c).isalpha()))
+
+def _playfair_letters(text):
+    """text reduced to the 25-letter Playfair alphabet: upper case, J as I, all else dropped."""
+    text = text.translate(_PLAYFAIR_NORMALIZE)
+    return text if text.isascii() else text.encode('ascii', 'ignore').decode('ascii')
+
+def playfair_digraphs(text):
+    """Single-pass generator of the digraphs format_text would produce, skipping non-letters."""
+    pending = None
+    for ch in _playfair_letters(text):
+        if pending is None:
+            pending = ch
+        elif pending == ch:
+            yield pending + "X"
+        else:
+            yield pending + ch
+            pending = None
+    if pending is not None:
+        yield pending + "X"
+
+
+class Playfair:
+    """Playfair keyed once: all 625 digraphs are mapped up front for encryption and decryption."""
+
+    def __init__(self, key):
+        self.matrix = generate_matrix(key)
+        pos = {ch: (r, c) for r, row in enumerate(self.matrix) for c, ch in enumerate(row)}
+        m = self.matrix
+        self.encrypt_table = {}
+        self.decrypt_table = {}
+        for a, (r1, c1) in pos.items():
+            for b, (r2, c2) in pos.items():
+                if r1 == r2:  # same row
+                    enc = m[r1][(c1+1)%5] + m[r2][(c2+1)%5]
+                    dec = m[r1][(c1-1)%5] + m[r2][(c2-1)%5]
+                elif c1 == c2:  # same column
+                    enc = m[(r1+1)%5][c1] + m[(r2+1)%5][c2]
+                    dec = m[(r1-1)%5][c1] + m[(r2-1)%5][c2]
+                else:  # rectangle
+                    enc = dec = m[r1][c2] + m[r2][c1]
+                self.encrypt_table[a + b] = enc
+                self.decrypt_table[a + b] = dec
+
+    def encrypt(self, text):
+        table = self.encrypt_table
+        return "".join([table[d] for d in playfair_digraphs(text)])
+
+    def decrypt(self, cipher):
+        """Inverts encrypt; the X fillers inserted by the formatter are left in place."""
+        cipher = _playfair_letters(cipher)
+        if len(cipher) % 2:
+            raise ValueError("Playfair ciphertext must contain an even number of letters.")
+        table = self.decrypt_table
+        return "".join([table[cipher[i:i+2]] for i in range(0, len(cipher), 2)])
+
+def playfair_decrypt(cipher, key):
+    return Playfair(key).decrypt(cipher)
+
+
+def benchmark_playfair(size_mb=4, reference_kb=256):
+    """Playfair object on a size_mb letters-only text; playfair_encrypt (quadratic) on a prefix."""
+    print(f"\n--- Playfair ({size_mb} MB of letters, playfair_encrypt on the first {reference_kb} KB) ---")
+    text = ("ATTACKATDAWNTHEQUICKBROWNFOXJUMPSOVERTHELAZYDOG" * ((size_mb << 20) // 47 + 1))[:size_mb << 20]
+    prefix = text[:reference_kb << 10]
+
+    start = time.perf_counter()
+    expected = playfair_encrypt(prefix, "KEYWORD")
+    reference = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cipher = Playfair("KEYWORD")
+    setup = time.perf_counter() - start
+    start = time.perf_counter()
+    result = cipher.encrypt(text)
+    encrypt = time.perf_counter() - start
+    start = time.perf_counter()
+    cipher.decrypt(result)
+    decrypt = time.perf_counter() - start
+
+    assert cipher.encrypt(prefix) == expected
+    print(f"playfair_encrypt: {len(prefix) / reference / 1e6:6.2f} MB/s")
+    print(f"Playfair encrypt: {len(text) / encrypt / 1e6:6.2f} MB/s, decrypt {len(result) / decrypt / 1e6:6.2f} MB/s "
+          f"(table setup {setup * 1e3:.2f} ms)")
+
+
 # ------------------ 3. Hill Cipher ------------------ #
 def hill_encrypt(text, key_matrix):
     text = text.upper().replace(" ", "")
@@ -72,29 +162,264 @@ def hill_encrypt(text, key_matrix):
     return cipher
 
 
+def _determinant(m):
+    """Exact integer determinant (Bareiss fraction-free elimination)."""
+    a = [list(row) for row in m]
+    n, sign, prev = len(a), 1, 1
+    for k in range(n - 1):
+        if a[k][k] == 0:
+            swap = next((i for i in range(k + 1, n) if a[i][k] != 0), None)
+            if swap is None:
+                return 0
+            a[k], a[swap] = a[swap], a[k]
+            sign = -sign
+        for i in range(k + 1, n):
+            for j in range(k + 1, n):
+                a[i][j] = (a[i][j] * a[k][k] - a[i][k] * a[k][j]) // prev
+        prev = a[k][k]
+    return sign * a[-1][-1]
+
+def hill_inverse_key(key_matrix):
+    """Inverse of an n x n key modulo 26 (det^-1 times the adjugate); ValueError if none exists."""
+    k = [[int(x) % 26 for x in row] for row in np.asarray(key_matrix)]
+    n = len(k)
+    if n == 0 or any(len(row) != n for row in k):
+        raise ValueError("Hill key must be a non-empty square matrix.")
+    try:
+        det_inv = mod_inverse(_determinant(k), 26)
+    except ValueError:
+        raise ValueError("Hill key is not invertible modulo 26.") from None
+    if n == 1:
+        return np.array([[det_inv]], dtype=np.int32)
+    minor = lambda i, j: [row[:j] + row[j+1:] for r, row in enumerate(k) if r != i]
+    adj = [[(-1) ** (i + j) * _determinant(minor(i, j)) for i in range(n)] for j in range(n)]
+    return np.array([[det_inv * x % 26 for x in row] for row in adj], dtype=np.int32)
+
+
+class Hill:
+    """Hill cipher with an n x n key; the inverse key is computed (and validated) once.
+
+    The message is viewed as a (blocks x n) matrix and multiplied by the key in one go
+    (in segments of segment_blocks rows to bound memory). Only letters are kept, as
+    upper case, and the final block is padded with X like hill_encrypt.
+    """
+
+    segment_blocks = 1 << 20
+
+    def __init__(self, key_matrix):
+        self.inverse = hill_inverse_key(key_matrix)
+        self.key = np.asarray(key_matrix, dtype=np.int64) % 26
+        self.n = len(self.key)
+
+    @classmethod
+    def generate(cls, n, rng=None):
+        """Random invertible n x n key."""
+        rng = rng or np.random.default_rng()
+        while True:
+            key = rng.integers(0, 26, (n, n))
+            try:
+                return cls(key)
+            except ValueError:
+                continue
+
+    @staticmethod
+    def _letters(text):
+        codes = np.frombuffer(text.upper().encode('ascii', 'ignore'), dtype=np.uint8)
+        return codes[(codes >= 65) & (codes <= 90)] - 65
+
+    def _apply(self, matrix, codes):
+        blocks = codes.reshape(-1, self.n)
+        out = np.empty_like(blocks)
+        mt = matrix.T.astype(np.int32)
+        for i in range(0, len(blocks), self.segment_blocks):
+            seg = blocks[i:i + self.segment_blocks].astype(np.int32) @ mt
+            out[i:i + self.segment_blocks] = seg % 26
+        return (out.ravel() + 65).tobytes().decode('ascii')
+
+    def encrypt(self, text):
+        codes = self._letters(text)
+        pad = -len(codes) % self.n
+        if pad:
+            codes = np.concatenate([codes, np.full(pad, 23, dtype=np.uint8)])  # X
+        return self._apply(self.key, codes)
+
+    def decrypt(self, cipher):
+        codes = self._letters(cipher)
+        if len(codes) % self.n:
+            raise ValueError(f"Hill ciphertext length must be a multiple of {self.n}.")
+        return self._apply(self.inverse, codes)
+
+def hill_decrypt(cipher, key_matrix):
+    return Hill(key_matrix).decrypt(cipher)
+
+
+def benchmark_hill(sizes_mb=(1, 10, 100), key_sizes=range(2, 9), reference_kb=64):
+    """Hill object across key sizes and input sizes; hill_encrypt on a reference_kb prefix."""
+    print(f"\n--- Hill cipher (MB/s encrypt / decrypt; hill_encrypt on {reference_kb} KB) ---")
+    rng = np.random.default_rng(1)
+    base = (rng.integers(0, 26, 1 << 20, dtype=np.uint8) + 65).tobytes().decode()
+    for n in key_sizes:
+        cipher = Hill.generate(n, rng)
+        prefix = base[:(reference_kb << 10) // n * n]
+        start = time.perf_counter()
+        expected = hill_encrypt(prefix, cipher.key)
+        reference = len(prefix) / (time.perf_counter() - start) / 1e6
+        assert cipher.encrypt(prefix) == expected
+
+        cells = []
+        for mb in sizes_mb:
+            text = base * mb
+            start = time.perf_counter()
+            enc = cipher.encrypt(text)
+            mid = time.perf_counter()
+            dec = cipher.decrypt(enc)
+            end = time.perf_counter()
+            assert dec[:len(text)] == text
+            cells.append(f"{mb:>4d} MB {len(text) / (mid - start) / 1e6:6.1f} / {len(text) / (end - mid) / 1e6:6.1f}")
+            del text, enc, dec
+        print(f"n = {n}: hill_encrypt {reference:5.2f} | " + " | ".join(cells))
+
 # ------------------ 4. Vigenere Cipher ------------------ #
 def vigenere_encrypt(text, key):
     text = text.upper()
     key = key.upper()
-    cipher = ""
-    for i, char in enumerate(text):
-        if char.isalpha():
-            shift = ord(key[i % len(key)]) - 65
-            cipher += chr((ord(char) - 65 + shift) % 26 + 65)
-        else:
-            cipher += char
-    return cipher
+    return "".join(chr((ord(char) - 65 + ord(key[i % len(key)]) - 65) % 26 + 65) if char.isalpha() else char
+                   for i, char in enumerate(text))
 
 def vigenere_decrypt(cipher, key):
-    text = ""
     key = key.upper()
-    for i, char in enumerate(cipher):
-        if char.isalpha():
-            shift = ord(key[i % len(key)]) - 65
-            text += chr((ord(char) - 65 - shift) % 26 + 65)
-        else:
-            text += char
-    return text
+    return "".join(chr((ord(char) - 65 - (ord(key[i % len(key)]) - 65)) % 26 + 65) if char.isalpha() else char
+                   for i, char in enumerate(cipher))
+
+
+# ------------------ 5. Streaming Caesar / Vigenere ------------------ #
+# Fixed-size chunks from any file-like object (text or binary), so memory stays constant.
+# Only ASCII letters are shifted (and upper-cased); every other character passes through
+# unchanged, so output length always equals input length.
+CHUNK_SIZE = 1 << 20
+
+@functools.lru_cache(maxsize=64)
+def caesar_tables(key):
+    """(str table, bytes table) mapping a-z and A-Z to the shifted upper-case letter."""
+    upper = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    shifted = upper[key % 26:] + upper[:key % 26]
+    str_table = str.maketrans(upper + upper.lower(), shifted + shifted)
+    bytes_table = bytes.maketrans((upper + upper.lower()).encode(), (shifted + shifted).encode())
+    return str_table, bytes_table
+
+def caesar_chunk(chunk, key):
+    str_table, bytes_table = caesar_tables(key)
+    return chunk.translate(bytes_table if isinstance(chunk, (bytes, bytearray)) else str_table)
+
+
+def _shift_table():
+    """Flat 26 x 256 table: entry 256 * shift + byte is the byte shifted as a letter (upper-cased)."""
+    codes = np.arange(256, dtype=np.uint8)
+    folded = codes | 32
+    is_alpha = (folded >= 97) & (folded <= 122)
+    return np.concatenate([np.where(is_alpha, (folded - 97 + k) % 26 + 65, codes).astype(np.uint8)
+                           for k in range(26)])
+
+SHIFT_TABLE = _shift_table()
+
+
+class VigenereStream:
+    """Vigenere over consecutive chunks; the key position carries across chunk boundaries.
+
+    Like vigenere_encrypt, every character (letter or not) advances the key.
+    """
+
+    def __init__(self, key, decrypt=False):
+        if not key.isascii() or not key.isalpha():
+            raise ValueError("Vigenere key must be a non-empty string of ASCII letters.")
+        shifts = np.frombuffer(key.upper().encode(), dtype=np.uint8) - 65
+        self.shifts = ((26 - shifts) % 26 if decrypt else shifts).astype(np.uint8)
+        self.rows = self.shifts.astype(np.intp) * 256  # row offsets into SHIFT_TABLE
+        self.decrypt = decrypt
+        self.offset = 0
+
+    def process(self, chunk):
+        if not isinstance(chunk, str):
+            codes = np.frombuffer(chunk, dtype=np.uint8)
+            return SHIFT_TABLE[self._key_stream(self.rows, len(codes)) + codes].tobytes()
+
+        # Text: one uint32 code point per character keeps character positions intact.
+        codes = np.frombuffer(chunk.encode('utf-32-le'), dtype=np.uint32)
+        shifts = self._key_stream(self.shifts, len(codes))
+        folded = codes | 32
+        is_alpha = (folded >= 97) & (folded <= 122)
+        out = np.where(is_alpha, (folded - 97 + shifts) % 26 + 65, codes).astype(np.uint32)
+        return out.tobytes().decode('utf-32-le')
+
+    def _key_stream(self, per_key, n):
+        """per_key repeated over n positions starting at the carried offset, which it advances."""
+        k = len(per_key)
+        stream = np.tile(np.roll(per_key, -self.offset), n // k + 1)[:n]
+        self.offset = (self.offset + n) % k
+        return stream
+
+
+def _pump(src, dst, transform, chunk_size):
+    total = 0
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return total
+        dst.write(transform(chunk))
+        total += len(chunk)
+
+def caesar_encrypt_stream(src, dst, key, chunk_size=CHUNK_SIZE):
+    """Encrypts src into dst chunk by chunk; returns the number of characters (or bytes) read."""
+    return _pump(src, dst, lambda chunk: caesar_chunk(chunk, key), chunk_size)
+
+def caesar_decrypt_stream(src, dst, key, chunk_size=CHUNK_SIZE):
+    return caesar_encrypt_stream(src, dst, -key, chunk_size)
+
+def vigenere_encrypt_stream(src, dst, key, chunk_size=CHUNK_SIZE):
+    return _pump(src, dst, VigenereStream(key).process, chunk_size)
+
+def vigenere_decrypt_stream(src, dst, key, chunk_size=CHUNK_SIZE):
+    return _pump(src, dst, VigenereStream(key, decrypt=True).process, chunk_size)
+
+
+def _peak_rss_mb():
+    """Peak resident set size in MB, or NaN where the resource module is missing (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return float("nan")
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    scale = 1 << 20 if sys.platform == "darwin" else 1 << 10
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+def benchmark_streams(size_mb=1024, chunk_size=CHUNK_SIZE):
+    """MB/s of the streaming engines over a size_mb file, with peak RSS after each pass."""
+    print(f"\n--- Streaming Caesar/Vigenere ({size_mb} MB file, {chunk_size >> 10} KiB chunks) ---")
+    block = (b"The quick brown fox jumps over the lazy dog, 1234567890! " * 20000)[:chunk_size]
+    with tempfile.TemporaryDirectory() as tmp:
+        plain, cipher, back = (os.path.join(tmp, name) for name in ("plain", "cipher", "back"))
+        with open(plain, "wb") as f:
+            written = 0
+            while written < size_mb << 20:
+                f.write(block)
+                written += len(block)
+        print(f"Peak RSS before: {_peak_rss_mb():.1f} MB")
+
+        for name, enc, dec, key in (("Caesar", caesar_encrypt_stream, caesar_decrypt_stream, 3),
+                                    ("Vigenere", vigenere_encrypt_stream, vigenere_decrypt_stream, "LEMON")):
+            for label, fn, src, dst in (("encrypt", enc, plain, cipher), ("decrypt", dec, cipher, back)):
+                with open(src, "rb") as fin, open(dst, "wb") as fout:
+                    start = time.perf_counter()
+                    n = fn(fin, fout, key, chunk_size)
+                    elapsed = time.perf_counter() - start
+                print(f"{name:<8} {label}: {n / elapsed / 1e6:8.1f} MB/s, peak RSS {_peak_rss_mb():.1f} MB")
+
+        sample = block[:1 << 18].decode()
+        for name, fn, key in (("Caesar", caesar_encrypt, 3), ("Vigenere", vigenere_encrypt, "LEMON")):
+            start = time.perf_counter()
+            fn(sample, key)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<8} per-character function: {len(sample) / elapsed / 1e6:8.2f} MB/s")
 
 
 # ------------------ Main (Testing) ------------------ #
@@ -113,12 +438,14 @@ if __name__ == "__main__":
     playfair_enc = playfair_encrypt("HELLO", playfair_key)
     print("\n--- Playfair Cipher ---")
     print("Encrypted:", playfair_enc)
+    print("Decrypted:", playfair_decrypt(playfair_enc, playfair_key))
 
     # Hill
     hill_key = np.array([[3, 3], [2, 5]])  # 2x2 matrix (invertible mod 26)
     hill_enc = hill_encrypt("HELLO", hill_key)
     print("\n--- Hill Cipher ---")
     print("Encrypted:", hill_enc)
+    print("Decrypted:", hill_decrypt(hill_enc, hill_key))
 
     # Vigenere
     vigenere_key = "KEY"
@@ -127,3 +454,9 @@ if __name__ == "__main__":
     print("\n--- Vigenere Cipher ---")
     print("Encrypted:", vigenere_enc)
     print("Decrypted:", vigenere_dec)
+
+    if "--bench" in sys.argv:
+        args = [a for a in sys.argv[1:] if a.isdigit()]
+        benchmark_streams(int(args[0]) if args else 1024)
+        benchmark_playfair()
+        benchmark_hill()
@@ -1,16 +1,10 @@
-def extended_gcd(a, b):
+import random
+import sys
+import time
 
-    if b == 0:
-        return a, 1, 0
-    g, x1, y1 = extended_gcd(b, a % b)
-    return g, y1, x1 - (a // b) * y1
+import numpy as np
 
-def mod_inverse(a, m):
-
-    g, x, _ = extended_gcd(a % m, m)
-    if g != 1:
-        raise ValueError(f"No modular inverse for {a} mod {m} (gcd={g})")
-    return x % m
+from numtheory import miller_rabin, mod_inverse
 
 def chinese_remainder_ext(a, n):
 
@@ -27,13 +21,143 @@ def chinese_remainder_ext(a, n):
 
     return total % N
 
-# ---------- Example usage ----------
-a = [2, 3, 2]  # remainders
-n = [3, 4, 5]  # moduli
+# ---------- Precomputed solver for a fixed modulus set ----------
+
+DIRECT_LIMIT = 16  # up to this many moduli, keep full-size coefficients instead of a tree
+
+def product_tree(values):
+    """Levels of pairwise products, from the values themselves up to their total product."""
+    levels = [list(values)]
+    while len(levels[-1]) > 1:
+        prev = levels[-1]
+        levels.append([prev[i] * prev[i + 1] if i + 1 < len(prev) else prev[i] for i in range(0, len(prev), 2)])
+    return levels
+
+def remainder_tree(x, tree):
+    """x mod every leaf of a product tree, reducing level by level from the root."""
+    rems = [x % tree[-1][0]]
+    for level in reversed(tree[:-1]):
+        rems = [rems[i // 2] % level[i] for i in range(len(level))]
+    return rems
+
+
+class CRTSolver:
+    """Solves x = a_i (mod n_i) for many residue vectors under one fixed set of moduli.
+
+    Construction computes w_i = (N / n_i)^-1 mod n_i once, using a remainder tree over the
+    squared moduli so that N / n_i mod n_i never needs a full-size division per modulus.
+    Each solve then needs only k small multiplications plus either k full-size
+    multiplications (few moduli) or a product-tree recombination (many moduli).
+    """
+
+    def __init__(self, moduli):
+        if not moduli:
+            raise ValueError("At least one modulus is required.")
+        self.moduli = list(moduli)
+        self.k = len(self.moduli)
+        self.tree = product_tree(self.moduli)
+        self.N = self.tree[-1][0]
+
+        squares = remainder_tree(self.N, product_tree([ni * ni for ni in self.moduli]))
+        self.weights = [mod_inverse((r // ni) % ni, ni) for r, ni in zip(squares, self.moduli)]
+
+        if self.k <= DIRECT_LIMIT:
+            self.cofactors = [self.N // ni for ni in self.moduli]
+            self.coefficients = [ci * wi for ci, wi in zip(self.cofactors, self.weights)]
+
+        # Vectorized residue step: a_i * w_i mod n_i fits uint64 when every n_i < 2^32.
+        self.vectorized = max(self.moduli) < (1 << 32)
+        if self.vectorized:
+            self._np_moduli = np.array(self.moduli, dtype=np.uint64)
+            self._np_weights = np.array(self.weights, dtype=np.uint64)
+
+    def _combine(self, t):
+        """Sum of t_i * N / n_i mod N, merged pairwise up the product tree."""
+        vals = list(t)
+        for level in self.tree[:-1]:
+            vals = [vals[i] * level[i + 1] + vals[i + 1] * level[i] if i + 1 < len(vals) else vals[i]
+                    for i in range(0, len(vals), 2)]
+        return vals[0] % self.N
+
+    def solve(self, residues):
+        if len(residues) != self.k:
+            raise ValueError(f"Expected {self.k} residues, got {len(residues)}.")
+        if self.k <= DIRECT_LIMIT:
+            return sum(ai * ci for ai, ci in zip(residues, self.coefficients)) % self.N
+        return self._combine([ai * wi % ni for ai, wi, ni in zip(residues, self.weights, self.moduli)])
+
+    def solve_many(self, residue_vectors):
+        """Solves a batch of residue vectors (a list of sequences or a (B, k) integer array)."""
+        if len(residue_vectors) == 0:
+            return []
+        if not self.vectorized:
+            return [self.solve(r) for r in residue_vectors]
+
+        a = np.asarray(residue_vectors)
+        if a.ndim != 2 or a.shape[1] != self.k:
+            raise ValueError(f"Residue vectors must have shape (B, {self.k}).")
+        if a.dtype == object or np.any(a < 0):
+            a = np.array([[int(x) % ni for x, ni in zip(row, self.moduli)] for row in a.tolist()], dtype=np.uint64)
+        t = (a.astype(np.uint64) % self._np_moduli) * self._np_weights % self._np_moduli
+
+        if self.k <= DIRECT_LIMIT:
+            cofactors, N = self.cofactors, self.N
+            return [sum(ti * ci for ti, ci in zip(row, cofactors)) % N for row in t.tolist()]
+        return [self._combine(row) for row in t.tolist()]
+
+
+# ---------- Benchmark ----------
+
+def _random_primes(count, bits=31):
+    """Distinct primes just below 2^bits (Miller-Rabin with bases 2, 3, 5, 7 is exact there)."""
+    primes = set()
+    while len(primes) < count:
+        n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if miller_rabin(n, bases=(2, 3, 5, 7)):
+            primes.add(n)
+    return list(primes)
+
+def benchmark(sizes=(3, 10, 100, 1000, 10000), batch=100):
+    """Per-vector solve time of CRTSolver against chinese_remainder_ext as k grows."""
+    print(f"\n--- CRT benchmark (31-bit prime moduli, batches of {batch} vectors) ---")
+    for k in sizes:
+        moduli = _random_primes(k)
+        vectors = [[random.randrange(ni) for ni in moduli] for _ in range(batch)]
+
+        start = time.perf_counter()
+        solver = CRTSolver(moduli)
+        setup = time.perf_counter() - start
+
+        reference_count = max(1, min(batch, 10 ** 6 // (k * k)))
+        start = time.perf_counter()
+        expected = [chinese_remainder_ext(v, moduli) for v in vectors[:reference_count]]
+        reference = (time.perf_counter() - start) / reference_count
+
+        start = time.perf_counter()
+        single = [solver.solve(v) for v in vectors]
+        solve = (time.perf_counter() - start) / batch
+
+        start = time.perf_counter()
+        many = solver.solve_many(vectors)
+        vectorized = (time.perf_counter() - start) / batch
+
+        assert single == many and single[:reference_count] == expected
+        print(f"k = {k:>5d} : setup {setup * 1e3:9.2f} ms | per vector: chinese_remainder_ext {reference * 1e3:9.3f} ms, "
+              f"solve {solve * 1e3:8.3f} ms, solve_many {vectorized * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    # ---------- Example usage ----------
+    a = [2, 3, 2]  # remainders
+    n = [3, 4, 5]  # moduli
+
+    print("Given system of congruences:")
+    for ai, ni in zip(a, n):
+        print(f"x ≡ {ai} (mod {ni})")
 
-print("Given system of congruences:")
-for ai, ni in zip(a, n):
-    print(f"x ≡ {ai} (mod {ni})")
+    x = chinese_remainder_ext(a, n)
+    print("\nSolution: x =", x)
+    print("CRTSolver:    x =", CRTSolver(n).solve(a))
 
-x = chinese_remainder_ext(a, n)
-print("\nSolution: x =", x)
+    if "--bench" in sys.argv:
+        benchmark()
@@ -0,0 +1,311 @@
+import concurrent.futures
+import functools
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+from ciphers import VigenereStream, caesar_chunk, caesar_encrypt, vigenere_encrypt
+from railRowcipher import rail_fence_decrypt_fast, rail_fence_encrypt, row_column_decrypt, row_column_encrypt
+
+# Key recovery for the classical ciphers in ciphers.py and railRowcipher.py.
+# Substitution ciphers (Caesar, Vigenere) are scored on single-letter frequencies with chi-squared;
+# transpositions keep the letter counts unchanged, so they are scored on English bigrams instead.
+
+
+# ------------------ English statistics ------------------ #
+
+ENGLISH_FREQ = np.array([
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]) / 100
+
+COMMON_BIGRAMS = {
+    "TH": 3.56, "HE": 3.07, "IN": 2.43, "ER": 2.05, "AN": 1.99, "RE": 1.85, "ON": 1.76, "AT": 1.49,
+    "EN": 1.45, "ND": 1.35, "TI": 1.34, "ES": 1.34, "OR": 1.28, "TE": 1.20, "OF": 1.17, "ED": 1.17,
+    "IS": 1.13, "IT": 1.12, "AL": 1.09, "AR": 1.07, "ST": 1.05, "TO": 1.04, "NT": 1.04, "NG": 0.95,
+    "SE": 0.93, "HA": 0.93, "AS": 0.87, "OU": 0.87, "IO": 0.83, "LE": 0.83, "VE": 0.83, "CO": 0.79,
+    "ME": 0.79, "DE": 0.76, "HI": 0.76, "RI": 0.73, "RO": 0.73, "IC": 0.70, "NE": 0.69, "EA": 0.69,
+    "RA": 0.69, "CE": 0.65, "LI": 0.62, "CH": 0.60, "LL": 0.58, "BE": 0.58, "MA": 0.57, "SI": 0.55,
+    "OM": 0.55, "UR": 0.54, "CA": 0.54, "EL": 0.53, "TA": 0.53, "LA": 0.53, "NS": 0.51, "DI": 0.50,
+    "FO": 0.50, "HO": 0.50, "PE": 0.49, "EC": 0.48, "PR": 0.48, "NO": 0.47, "CT": 0.46, "US": 0.45,
+    "AC": 0.45, "OT": 0.44, "IL": 0.43, "TR": 0.43, "LY": 0.43, "NC": 0.42, "ET": 0.42, "UT": 0.42,
+    "SS": 0.41, "SO": 0.40, "RS": 0.40, "UN": 0.39, "LO": 0.39, "WA": 0.38, "GE": 0.38, "IE": 0.38,
+    "WH": 0.38, "EE": 0.38, "WI": 0.37, "EM": 0.37, "AD": 0.37, "OL": 0.37, "RT": 0.36, "PO": 0.36,
+    "WE": 0.36, "NA": 0.35, "UL": 0.35, "NI": 0.34, "TS": 0.34, "MO": 0.34, "OW": 0.33, "PA": 0.32,
+    "IM": 0.32, "MI": 0.32, "AI": 0.32, "SH": 0.32,
+}
+
+def _bigram_table():
+    """27 x 27 log-probabilities; index 26 stands for the row/column cipher's '_' padding."""
+    floor = np.log(0.01 / 100)
+    table = np.full((27, 27), floor)
+    for pair, pct in COMMON_BIGRAMS.items():
+        table[ord(pair[0]) - 65, ord(pair[1]) - 65] = np.log(pct / 100)
+    # Letters not in the common list are scored between the floor and the rarest listed pair.
+    table[:26, :26] = np.maximum(table[:26, :26], np.log(np.outer(ENGLISH_FREQ, ENGLISH_FREQ) / 8))
+    return table
+
+BIGRAM_LOGP = _bigram_table()
+_SHIFT_INDEX = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26  # [shift, plain letter]
+
+
+def letter_codes(text):
+    """Letters of text (str or bytes) as 0..25, in order; everything else is dropped."""
+    raw = text.upper().encode('ascii', 'ignore') if isinstance(text, str) else bytes(text).upper()
+    codes = np.frombuffer(raw, dtype=np.uint8)
+    return codes[(codes >= 65) & (codes <= 90)] - 65
+
+def letter_counts(text):
+    return np.bincount(letter_codes(text), minlength=26)
+
+def chi_squared_shifts(counts):
+    """Chi-squared against English for all 26 Caesar decryptions at once.
+
+    counts has shape (..., 26); the result has the same shape, entry s scoring a shift back by s.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    observed = counts[..., _SHIFT_INDEX]                                 # (..., shift, plain letter)
+    expected = counts.sum(axis=-1)[..., None, None] * ENGLISH_FREQ
+    return ((observed - expected) ** 2 / np.where(expected > 0, expected, 1)).sum(axis=-1)
+
+def bigram_score(text):
+    """Mean English bigram log-probability of the letters in text (higher is more English)."""
+    codes = letter_codes(text)
+    if len(codes) < 2:
+        return float(BIGRAM_LOGP.min())
+    return float(BIGRAM_LOGP[codes[:-1], codes[1:]].mean())
+
+
+# ------------------ Caesar ------------------ #
+
+def crack_caesar(cipher):
+    """(key, plaintext) for a caesar_encrypt ciphertext."""
+    key = int(np.argmin(chi_squared_shifts(letter_counts(cipher))))
+    return key, caesar_chunk(cipher, -key)
+
+
+# ------------------ Vigenere ------------------ #
+
+def index_of_coincidence(counts):
+    counts = np.asarray(counts, dtype=np.float64)
+    n = counts.sum(axis=-1)
+    return (counts * (counts - 1)).sum(axis=-1) / np.maximum(n * (n - 1), 1)
+
+def column_counts(cipher, key_length):
+    """(key_length, 26) letter counts per key position.
+
+    vigenere_encrypt advances the key on every character, letters or not, so columns are taken
+    over character positions in the full text.
+    """
+    raw = cipher.upper().encode('utf-32-le') if isinstance(cipher, str) else bytes(cipher).upper()
+    codes = np.frombuffer(raw, dtype=np.uint32 if isinstance(cipher, str) else np.uint8)
+    positions = np.flatnonzero((codes >= 65) & (codes <= 90))
+    cells = (positions % key_length) * 26 + (codes[positions] - 65)
+    return np.bincount(cells, minlength=key_length * 26).reshape(key_length, 26)
+
+def vigenere_key_length(cipher, max_length=20):
+    """Shortest key length whose columns look like English by index of coincidence.
+
+    Multiples of the true length score just as well, so the first length reaching 90% of the best
+    average column IC is taken rather than the overall maximum.
+    """
+    ics = [float(index_of_coincidence(column_counts(cipher, length)).mean())
+           for length in range(1, max_length + 1)]
+    best = max(ics)
+    return next(length for length, ic in enumerate(ics, 1) if ic >= 0.9 * best)
+
+def crack_vigenere(cipher, max_key_length=20):
+    """(key, plaintext) for a vigenere_encrypt ciphertext: IC key length, then per-column chi-squared."""
+    length = vigenere_key_length(cipher, max_key_length)
+    shifts = np.argmin(chi_squared_shifts(column_counts(cipher, length)), axis=-1)
+    key = "".join(chr(65 + int(s)) for s in shifts)
+    return key, VigenereStream(key, decrypt=True).process(cipher)
+
+
+# ------------------ Transpositions (worker functions) ------------------ #
+
+def _rail_chunk(cipher, keys):
+    return [(bigram_score(rail_fence_decrypt_fast(cipher, key)), key) for key in keys]
+
+def _block_pair_scores(cipher, columns):
+    """S[a, b]: bigram score of cipher block a sitting directly left of block b in every row."""
+    raw = np.frombuffer(cipher.upper().encode('ascii', 'replace'), dtype=np.uint8)
+    codes = np.where((raw >= 65) & (raw <= 90), raw - 65, 26).astype(np.intp)
+    blocks = codes.reshape(columns, -1)
+    return BIGRAM_LOGP[blocks[:, None, :], blocks[None, :, :]].sum(axis=-1)
+
+def _row_column_chunk(pair_scores, first, keep=3):
+    """Best `keep` column orders starting with block `first`, ranked by pair_scores alone."""
+    columns = len(pair_scores)
+    rest = [c for c in range(columns) if c != first]
+    orders = np.array([(first,) + p for p in itertools.permutations(rest)], dtype=np.intp)
+    scores = pair_scores[orders[:, :-1], orders[:, 1:]].sum(axis=-1)
+    top = np.argsort(scores)[::-1][:keep]
+    return [tuple(int(c) for c in orders[i]) for i in top], len(orders)
+
+def _order_to_key(order):
+    """Digit key for row_column_* whose sorted order reads the blocks in this column order."""
+    return "".join(str(block + 1) for block in order)
+
+
+# ------------------ Engine ------------------ #
+
+class Cryptanalyzer:
+    """Key searches spread over a process pool kept for the lifetime of the object.
+
+    workers=1 runs everything in-process. The counters `keys_tested` accumulate across calls
+    so the benchmark can report keys per second.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.keys_tested = 0
+        self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _run(self, fn, arg_lists):
+        if self.workers == 1:
+            return [fn(*args) for args in arg_lists]
+        pool = self._executor()
+        return [f.result() for f in [pool.submit(fn, *args) for args in arg_lists]]
+
+    def crack_caesar(self, cipher):
+        self.keys_tested += 26
+        return crack_caesar(cipher)
+
+    def crack_vigenere(self, cipher, max_key_length=20):
+        key, plaintext = crack_vigenere(cipher, max_key_length)
+        self.keys_tested += 26 * len(key)
+        return key, plaintext
+
+    def crack_rail_fence(self, cipher, max_rails=None):
+        """(key, plaintext) for rail_fence_encrypt: every rail count 2..max_rails is decrypted and scored."""
+        max_rails = min(max_rails or 64, max(len(cipher) - 1, 2))
+        keys = list(range(2, max_rails + 1))
+        # One chunk of keys per worker; each decryption is a cached O(n) gather.
+        chunks = [(cipher, keys[i::self.workers]) for i in range(min(self.workers, len(keys)))]
+        results = [r for chunk in self._run(_rail_chunk, chunks) for r in chunk]
+        self.keys_tested += len(keys)
+        _, key = max(results)
+        return key, rail_fence_decrypt_fast(cipher, key)
+
+    def crack_row_column(self, cipher, max_columns=8):
+        """(key, plaintext) for row_column_encrypt, trying every column order for each width.
+
+        The ciphertext is split into one block per column; an order is ranked by the sum of
+        precomputed block-pair bigram scores, so each candidate key costs columns - 1 lookups.
+        Within-row pairs alone favour narrow widths (a divisor of the true width still joins
+        genuine bigrams), so the leading orders of every width are decrypted and compared on
+        the full reassembled plaintext, joins across rows included.
+        Returned keys are digit strings such as "4312567".
+        """
+        best = None
+        for columns in range(2, min(max_columns, 9) + 1):
+            if len(cipher) % columns:
+                continue
+            pair_scores = _block_pair_scores(cipher, columns)
+            for orders, count in self._run(_row_column_chunk, [(pair_scores, f) for f in range(columns)]):
+                self.keys_tested += count
+                for order in orders:
+                    key = _order_to_key(order)
+                    plaintext = row_column_decrypt(cipher, key)
+                    score = bigram_score(plaintext)
+                    if best is None or score > best[0]:
+                        best = (score, key, plaintext)
+        if best is None:
+            raise ValueError("Ciphertext length is not a multiple of any candidate column count.")
+        return best[1], best[2]
+
+    def crack_many(self, method, ciphertexts, **kwargs):
+        """Runs crack_caesar or crack_vigenere over many ciphertexts, one pool task per text."""
+        fn = {"caesar": crack_caesar, "vigenere": crack_vigenere}[method]
+        fn = functools.partial(fn, **kwargs) if kwargs else fn
+        ciphertexts = list(ciphertexts)
+        if self.workers == 1:
+            results = [fn(c) for c in ciphertexts]
+        else:
+            results = list(self._executor().map(fn, ciphertexts, chunksize=max(1, len(ciphertexts) // (4 * self.workers))))
+        self.keys_tested += sum(26 * len(key) if method == "vigenere" else 26 for key, _ in results)
+        return results
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ------------------ Benchmark ------------------ #
+
+SAMPLE_TEXT = (
+    "IT WAS THE BEST OF TIMES IT WAS THE WORST OF TIMES IT WAS THE AGE OF WISDOM IT WAS THE AGE OF "
+    "FOOLISHNESS IT WAS THE EPOCH OF BELIEF IT WAS THE EPOCH OF INCREDULITY IT WAS THE SEASON OF LIGHT "
+    "IT WAS THE SEASON OF DARKNESS IT WAS THE SPRING OF HOPE IT WAS THE WINTER OF DESPAIR WE HAD "
+    "EVERYTHING BEFORE US WE HAD NOTHING BEFORE US WE WERE ALL GOING DIRECT TO HEAVEN WE WERE ALL "
+    "GOING DIRECT THE OTHER WAY"
+)
+
+def benchmark(workers_list=sorted({1, os.cpu_count() or 1}), texts=200, rail_length=4000, max_rails=64):
+    """Keys tested per second for each attack, in-process and across the pool."""
+    rng = np.random.default_rng(7)
+    words = SAMPLE_TEXT.split()
+    make = lambda n: " ".join(words[i % len(words)] for i in rng.integers(0, len(words), n))
+
+    caesar_texts = [caesar_encrypt(make(60), int(k)) for k in rng.integers(1, 26, texts)]
+    vigenere_keys = ["".join(chr(65 + int(c)) for c in rng.integers(0, 26, int(n))) for n in rng.integers(3, 12, texts)]
+    vigenere_texts = [vigenere_encrypt(make(400), k) for k in vigenere_keys]
+    rail_plain = make(rail_length // 5)
+    rail_cipher = rail_fence_encrypt(rail_plain, 17)
+    rc_plain = make(300)
+    rc_cipher = row_column_encrypt(rc_plain, "31524867")
+    rc_short = row_column_encrypt(SAMPLE_TEXT, "3142")  # its divisor width 2 must not win
+
+    print(f"\n--- Cryptanalysis benchmark ({texts} Caesar/Vigenere texts, rail fence over {len(rail_cipher)} chars) ---")
+    for workers in workers_list:
+        with Cryptanalyzer(workers) as engine:
+            engine._run(len, [("warm",)] * engine.workers)  # start the pool outside the timing
+            for name, attack in (
+                ("Caesar", lambda: engine.crack_many("caesar", caesar_texts)),
+                ("Vigenere", lambda: engine.crack_many("vigenere", vigenere_texts)),
+                ("Rail fence", lambda: [engine.crack_rail_fence(rail_cipher, max_rails)]),
+                ("Row/column", lambda: [engine.crack_row_column(rc_cipher, 8), engine.crack_row_column(rc_short, 8)]),
+            ):
+                engine.keys_tested = 0
+                start = time.perf_counter()
+                results = attack()
+                elapsed = time.perf_counter() - start
+                print(f"workers = {workers:>2d} | {name:<10}: {engine.keys_tested / elapsed:12.0f} keys/s "
+                      f"({engine.keys_tested} keys in {elapsed:.2f} s)")
+                if name == "Vigenere":
+                    solved = sum(k == v for (k, _), v in zip(results, vigenere_keys))
+                    print(f"{'':16}recovered {solved}/{texts} keys")
+                elif name == "Rail fence":
+                    assert results[0] == (17, rail_plain)
+                elif name == "Row/column":
+                    assert results[0][1] == rc_plain.replace(" ", "")
+                    assert results[1] == ("3142", SAMPLE_TEXT.replace(" ", ""))
+
+
+if __name__ == "__main__":
+    cipher = caesar_encrypt(SAMPLE_TEXT, 7)
+    print("Caesar key:", crack_caesar(cipher)[0])
+    cipher = vigenere_encrypt(SAMPLE_TEXT, "LEMON")
+    print("Vigenere key:", crack_vigenere(cipher)[0])
+    with Cryptanalyzer(workers=1) as engine:
+        print("Rail fence key:", engine.crack_rail_fence(rail_fence_encrypt(SAMPLE_TEXT, 5), 20)[0])
+        print("Row/column key:", engine.crack_row_column(row_column_encrypt(SAMPLE_TEXT, "4312567"), 8)[0])
+
+    if "--bench" in sys.argv:
+        benchmark()
@@ -1,21 +1,299 @@
+import concurrent.futures
+import os
 import random
+import sys
+import time
 
-def mod_pow(base, exp, mod):
-    result = 1
-    base %= mod
-    while exp > 0:
-        if exp % 2 == 1:
-            result = (result * base) % mod
-        exp = exp >> 1
-        base = (base * base) % mod
-    return result
-
-p = 23
-g = 5
-a = random.randint(2, p-2)
-b = random.randint(2, p-2)
-A = mod_pow(g, a, p)
-B = mod_pow(g, b, p)
-shared_key_alice = mod_pow(B, a, p)
-shared_key_bob = mod_pow(A, b, p)
-print(f"Shared Key Alice: {shared_key_alice}, Shared Key Bob: {shared_key_bob}")    
\ No newline at end of file
+from numtheory import SMALL_PRIMES, FixedBaseTable, ModContext, miller_rabin
+
+# ------------------ Standard groups ------------------ #
+
+def _rfc_hex(text):
+    return int("".join(text.split()), 16)
+
+# RFC 3526 MODP groups 14, 15 and 16 (generator 2)
+MODP_2048 = _rfc_hex("""
+    FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+    020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+    4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+    EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+    98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+    9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA18217C 32905E46 2E36CE3B
+    E39E772C 180E8603 9B2783A2 EC07A28F B5C55DF0 6F4C52C9 DE2BCBF6 95581718
+    3995497C EA956AE5 15D22618 98FA0510 15728E5A 8AACAA68 FFFFFFFF FFFFFFFF
+""")
+
+MODP_3072 = _rfc_hex("""
+    FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+    020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+    4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+    EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+    98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+    9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA18217C 32905E46 2E36CE3B
+    E39E772C 180E8603 9B2783A2 EC07A28F B5C55DF0 6F4C52C9 DE2BCBF6 95581718
+    3995497C EA956AE5 15D22618 98FA0510 15728E5A 8AAAC42D AD33170D 04507A33
+    A85521AB DF1CBA64 ECFB8504 58DBEF0A 8AEA7157 5D060C7D B3970F85 A6E1E4C7
+    ABF5AE8C DB0933D7 1E8C94E0 4A25619D CEE3D226 1AD2EE6B F12FFA06 D98A0864
+    D8760273 3EC86A64 521F2B18 177B200C BBE11757 7A615D6C 770988C0 BAD946E2
+    08E24FA0 74E5AB31 43DB5BFC E0FD108E 4B82D120 A93AD2CA FFFFFFFF FFFFFFFF
+""")
+
+MODP_4096 = _rfc_hex("""
+    FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+    020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+    4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+    EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+    98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+    9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA18217C 32905E46 2E36CE3B
+    E39E772C 180E8603 9B2783A2 EC07A28F B5C55DF0 6F4C52C9 DE2BCBF6 95581718
+    3995497C EA956AE5 15D22618 98FA0510 15728E5A 8AAAC42D AD33170D 04507A33
+    A85521AB DF1CBA64 ECFB8504 58DBEF0A 8AEA7157 5D060C7D B3970F85 A6E1E4C7
+    ABF5AE8C DB0933D7 1E8C94E0 4A25619D CEE3D226 1AD2EE6B F12FFA06 D98A0864
+    D8760273 3EC86A64 521F2B18 177B200C BBE11757 7A615D6C 770988C0 BAD946E2
+    08E24FA0 74E5AB31 43DB5BFC E0FD108E 4B82D120 A9210801 1A723C12 A787E6D7
+    88719A10 BDBA5B26 99C32718 6AF4E23C 1A946834 B6150BDA 2583E9CA 2AD44CE8
+    DBBBC2DB 04DE8EF9 2E8EFC14 1FBECAA6 287C5947 4E6BC05D 99B2964F A090C3A2
+    233BA186 515BE7ED 1F612970 CEE2D7AF B81BDD76 2170481C D0069127 D5B05AA9
+    93B4EA98 8D8FDDC1 86FFB7DC 90A6C08F 4DF435C9 34063199 FFFFFFFF FFFFFFFF
+""")
+
+# RFC 7919 ffdhe groups (generator 2)
+FFDHE_2048 = _rfc_hex("""
+    FFFFFFFF FFFFFFFF ADF85458 A2BB4A9A AFDC5620 273D3CF1 D8B9C583 CE2D3695
+    A9E13641 146433FB CC939DCE 249B3EF9 7D2FE363 630C75D8 F681B202 AEC4617A
+    D3DF1ED5 D5FD6561 2433F51F 5F066ED0 85636555 3DED1AF3 B557135E 7F57C935
+    984F0C70 E0E68B77 E2A689DA F3EFE872 1DF158A1 36ADE735 30ACCA4F 483A797A
+    BC0AB182 B324FB61 D108A94B B2C8E3FB B96ADAB7 60D7F468 1D4F42A3 DE394DF4
+    AE56EDE7 6372BB19 0B07A7C8 EE0A6D70 9E02FCE1 CDF7E2EC C03404CD 28342F61
+    9172FE9C E98583FF 8E4F1232 EEF28183 C3FE3B1B 4C6FAD73 3BB5FCBC 2EC22005
+    C58EF183 7D1683B2 C6F34A26 C1B2EFFA 886B4238 61285C97 FFFFFFFF FFFFFFFF
+""")
+
+FFDHE_3072 = _rfc_hex("""
+    FFFFFFFF FFFFFFFF ADF85458 A2BB4A9A AFDC5620 273D3CF1 D8B9C583 CE2D3695
+    A9E13641 146433FB CC939DCE 249B3EF9 7D2FE363 630C75D8 F681B202 AEC4617A
+    D3DF1ED5 D5FD6561 2433F51F 5F066ED0 85636555 3DED1AF3 B557135E 7F57C935
+    984F0C70 E0E68B77 E2A689DA F3EFE872 1DF158A1 36ADE735 30ACCA4F 483A797A
+    BC0AB182 B324FB61 D108A94B B2C8E3FB B96ADAB7 60D7F468 1D4F42A3 DE394DF4
+    AE56EDE7 6372BB19 0B07A7C8 EE0A6D70 9E02FCE1 CDF7E2EC C03404CD 28342F61
+    9172FE9C E98583FF 8E4F1232 EEF28183 C3FE3B1B 4C6FAD73 3BB5FCBC 2EC22005
+    C58EF183 7D1683B2 C6F34A26 C1B2EFFA 886B4238 611FCFDC DE355B3B 6519035B
+    BC34F4DE F99C0238 61B46FC9 D6E6C907 7AD91D26 91F7F7EE 598CB0FA C186D91C
+    AEFE1309 85139270 B4130C93 BC437944 F4FD4452 E2D74DD3 64F2E21E 71F54BFF
+    5CAE82AB 9C9DF69E E86D2BC5 22363A0D ABC52197 9B0DEADA 1DBF9A42 D5C4484E
+    0ABCD06B FA53DDEF 3C1B20EE 3FD59D7C 25E41D2B 66C62E37 FFFFFFFF FFFFFFFF
+""")
+
+GROUPS = {
+    "modp2048": MODP_2048,
+    "modp3072": MODP_3072,
+    "modp4096": MODP_4096,
+    "ffdhe2048": FFDHE_2048,
+    "ffdhe3072": FFDHE_3072,
+}
+
+
+# ------------------ Safe-prime generation ------------------ #
+
+def generate_safe_prime(bits):
+    """Random safe prime p = 2q + 1 (q prime) with exactly `bits` bits.
+
+    Both q and p must survive trial division before either gets a Miller-Rabin test, and the
+    cheap base-2 Fermat test on p runs before the full test on q.
+    """
+    if bits < 16:
+        raise ValueError("Safe primes below 16 bits are not supported.")
+    while True:
+        q = random.getrandbits(bits - 1) | (1 << (bits - 2)) | 1
+        p = 2 * q + 1
+        if any(q % sp == 0 or p % sp == 0 for sp in SMALL_PRIMES if sp < q):
+            continue
+        if pow(2, p - 1, p) == 1 and miller_rabin(q) and miller_rabin(p):
+            return p
+
+
+# ------------------ Group API ------------------ #
+
+class DHGroup:
+    """Finite-field Diffie-Hellman group with a fixed-base table for g built once per group.
+
+    With a safe prime p = 2q + 1 and g = 2, private exponents of exponent_bits bits are used
+    (RFC 7919 recommends at least twice the security level), so the table only has to cover
+    exponent_bits and each public key costs about exponent_bits / window multiplications.
+    """
+
+    def __init__(self, p, g=2, exponent_bits=256, window=8, name=None):
+        if p < 5 or not 1 < g < p - 1:
+            raise ValueError("Invalid Diffie-Hellman group parameters.")
+        self.p = p
+        self.g = g
+        self.q = (p - 1) // 2
+        self.exponent_bits = min(exponent_bits, self.q.bit_length() - 1)
+        self.window = window
+        self.name = name or f"custom{p.bit_length()}"
+        self.ctx = ModContext(p)
+        self.g_table = FixedBaseTable(g, p, self.exponent_bits, window)
+        self._pool = None
+        self._pool_workers = None
+
+    @classmethod
+    def named(cls, name, **kwargs):
+        """One of GROUPS, e.g. "modp2048" (RFC 3526) or "ffdhe3072" (RFC 7919)."""
+        if name not in GROUPS:
+            raise ValueError(f"Unknown group {name!r}; choose from {sorted(GROUPS)}.")
+        return cls(GROUPS[name], 2, name=name, **kwargs)
+
+    @classmethod
+    def generate(cls, bits, **kwargs):
+        """New group over a freshly generated safe prime; g = 4 generates the order-q subgroup."""
+        return cls(generate_safe_prime(bits), 4, **kwargs)
+
+    def generate_private_key(self):
+        return random.randint(2, (1 << self.exponent_bits) - 1)
+
+    def public_key(self, private_key):
+        return self.g_table.pow(private_key)
+
+    def generate_keypair(self):
+        private_key = self.generate_private_key()
+        return private_key, self.public_key(private_key)
+
+    def check_public_key(self, public_key):
+        if not 1 < public_key < self.p - 1:
+            raise ValueError("Peer public key is out of range.")
+
+    def shared_secret(self, private_key, peer_public_key):
+        self.check_public_key(peer_public_key)
+        return self.ctx.pow(peer_public_key, private_key)
+
+    def generate_keypairs(self, n, workers=None):
+        """n fresh (private, public) pairs; with workers > 1 they are split across a process pool."""
+        if not workers or workers == 1:
+            return [self.generate_keypair() for _ in range(n)]
+        pool = self._executor(workers)
+        futures = [pool.submit(_keypair_chunk, self.spec, size) for size in _split(n, workers)]
+        return [pair for f in futures for pair in f.result()]
+
+    def derive_shared(self, pairs, workers=None):
+        """Shared secrets for a list of (private_key, peer_public_key) pairs."""
+        pairs = list(pairs)
+        if not workers or workers == 1:
+            return [self.shared_secret(a, peer) for a, peer in pairs]
+        pool = self._executor(workers)
+        step = -(-len(pairs) // workers) or 1
+        futures = [pool.submit(_shared_chunk, self.spec, pairs[i:i + step]) for i in range(0, len(pairs), step)]
+        return [secret for f in futures for secret in f.result()]
+
+    @property
+    def spec(self):
+        """Picklable (p, g, exponent_bits, window) that worker_group() turns back into a group."""
+        return self.p, self.g, self.exponent_bits, self.window
+
+    def _executor(self, workers):
+        """Process pool kept for the lifetime of the group, so workers build their table once."""
+        if self._pool is None or self._pool_workers != workers:
+            self.close()
+            register_worker_group(self)
+            self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=random.seed)
+            self._pool_workers = workers
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_WORKER_GROUPS = {}
+
+def _split(n, parts):
+    return [n // parts + (1 if i < n % parts else 0) for i in range(parts) if n // parts or i < n % parts]
+
+def register_worker_group(group):
+    """Make worker_group(group.spec) return this group.
+
+    Call it before starting a process pool so forked workers inherit the group (and its
+    table) instead of rebuilding it.
+    """
+    _WORKER_GROUPS[group.spec] = group
+
+def worker_group(spec):
+    """The group for a DHGroup.spec, built once per process and reused by later tasks."""
+    group = _WORKER_GROUPS.get(spec)
+    if group is None:
+        p, g, exponent_bits, window = spec
+        group = _WORKER_GROUPS[spec] = DHGroup(p, g, exponent_bits, window)
+    return group
+
+def _keypair_chunk(spec, count):
+    group = worker_group(spec)
+    return [group.generate_keypair() for _ in range(count)]
+
+def _shared_chunk(spec, pairs):
+    group = worker_group(spec)
+    return [group.shared_secret(a, peer) for a, peer in pairs]
+
+
+# ------------------ Benchmark ------------------ #
+
+def benchmark(names=("modp2048", "modp3072"), exchanges=50, workers=os.cpu_count()):
+    """Full exchanges/sec (two keypairs + two shared secrets) against from-scratch pow."""
+    for name in names:
+        start = time.perf_counter()
+        group = DHGroup.named(name)
+        setup = time.perf_counter() - start
+        p, g = group.p, group.g
+
+        start = time.perf_counter()
+        for _ in range(exchanges):
+            a, b = group.generate_private_key(), group.generate_private_key()
+            A, B = pow(g, a, p), pow(g, b, p)
+            assert pow(B, a, p) == pow(A, b, p)
+        baseline = exchanges / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(exchanges):
+            a, A = group.generate_keypair()
+            b, B = group.generate_keypair()
+            assert group.shared_secret(a, B) == group.shared_secret(b, A)
+        single = exchanges / (time.perf_counter() - start)
+
+        group.generate_keypairs(workers or 1, workers)  # start the pool outside the timing
+        start = time.perf_counter()
+        alice = group.generate_keypairs(exchanges, workers)
+        bob = group.generate_keypairs(exchanges, workers)
+        secrets_a = group.derive_shared([(a, B) for (a, _), (_, B) in zip(alice, bob)], workers)
+        secrets_b = group.derive_shared([(b, A) for (_, A), (b, _) in zip(alice, bob)], workers)
+        bulk = exchanges / (time.perf_counter() - start)
+        assert secrets_a == secrets_b
+        group.close()
+
+        print(f"\n--- Diffie-Hellman benchmark ({name}, {p.bit_length()} bits, {group.exponent_bits}-bit exponents) ---")
+        print(f"group setup (g table)         : {setup * 1e3:8.1f} ms")
+        print(f"pow from scratch              : {baseline:8.1f} exchanges/s")
+        print(f"DHGroup keypair + shared      : {single:8.1f} exchanges/s  ({single / baseline:4.1f}x)")
+        print(f"bulk generate/derive ({workers or 1} proc) : {bulk:8.1f} exchanges/s  ({bulk / baseline:4.1f}x)")
+
+
+if __name__ == "__main__":
+    # Toy exchange over a tiny safe-prime group (p = 2*11 + 1), as in the original lab script
+    toy = DHGroup(23, 5, exponent_bits=4)
+    a, A = toy.generate_keypair()
+    b, B = toy.generate_keypair()
+    shared_key_alice = toy.shared_secret(a, B)
+    shared_key_bob = toy.shared_secret(b, A)
+    print(f"Shared Key Alice: {shared_key_alice}, Shared Key Bob: {shared_key_bob}")
+
+    group = DHGroup.named("modp2048")
+    a, A = group.generate_keypair()
+    b, B = group.generate_keypair()
+    print(f"{group.name}: shared secrets match = {group.shared_secret(a, B) == group.shared_secret(b, A)}")
+
+    if "--bench" in sys.argv:
+        benchmark()
@@ -1,27 +1,77 @@
+import random
+import sys
+import time
+
+# Extended Euclidean Algorithm (iterative, shared with the RSA/DSA/CRT modules)
+from numtheory import extended_gcd
+
 # Euclidean Algorithm
 def gcd(a, b):
     while b != 0:
         a, b = b, a % b
     return a
 
-# Extended Euclidean Algorithm
-def extended_gcd(a, b):
-    if b == 0:
-        return a, 1, 0  # gcd, x, y
-    else:
-        gcd, x1, y1 = extended_gcd(b, a % b)
-        x = y1
-        y = x1 - (a // b) * y1
-        return gcd, x, y
-
 # Modular Inverse using Extended Euclidean Algorithm
 def mod_inverse(a, m):
-    gcd, x, y = extended_gcd(a, m)
-    if gcd != 1:
+    g, x, y = extended_gcd(a, m)
+    if g != 1:
         return None  # No inverse if gcd != 1
     else:
         return x % m
 
+# Batch Modular Inverse (Montgomery's trick)
+def batch_mod_inverse(values, m):
+    """Inverts every value modulo m with one extended GCD and 3(n-1) multiplications.
+
+    Returns a list aligned with values; elements with no inverse (gcd with m != 1) come back
+    as None instead of failing the whole batch. When the running product is not invertible,
+    the batch is split in halves until the offending elements are isolated.
+    """
+    vals = [v % m for v in values]
+    result = [None] * len(vals)
+    _invert_range(vals, 0, len(vals), m, result)
+    return result
+
+def _invert_range(vals, lo, hi, m, result):
+    if lo >= hi:
+        return
+    prefix = [1] * (hi - lo)
+    acc = 1
+    for i in range(lo, hi):
+        acc = acc * vals[i] % m
+        prefix[i - lo] = acc
+
+    g, x, _ = extended_gcd(acc, m)
+    if g != 1:
+        if hi - lo > 1:
+            mid = (lo + hi) // 2
+            _invert_range(vals, lo, mid, m, result)
+            _invert_range(vals, mid, hi, m, result)
+        return
+
+    inv = x % m
+    for i in range(hi - 1, lo, -1):
+        result[i] = inv * prefix[i - lo - 1] % m
+        inv = inv * vals[i] % m
+    result[lo] = inv % m
+
+# Benchmark: batch inversion against one mod_inverse per element
+def benchmark_batch_inverse(sizes=(10, 100, 1000, 10000, 100000, 1000000), single_limit=10000):
+    m = 2 ** 255 - 19  # prime, so every non-zero value is invertible
+    print("\n--- Batch modular inverse benchmark (modulus 2^255 - 19) ---")
+    for n in sizes:
+        values = [random.randrange(1, m) for _ in range(n)]
+        start = time.perf_counter()
+        inverses = batch_mod_inverse(values, m)
+        batch = (time.perf_counter() - start) / n
+
+        sample = values[:single_limit]
+        start = time.perf_counter()
+        expected = [mod_inverse(v, m) for v in sample]
+        single = (time.perf_counter() - start) / len(sample)
+        assert inverses[:single_limit] == expected
+        print(f"n = {n:>7d} : batch {batch * 1e6:8.2f} us/elem, mod_inverse {single * 1e6:8.2f} us/elem ({single / batch:5.1f}x)")
+
 # =============================
 # Example Usage
 # =============================
@@ -39,3 +89,8 @@ if __name__ == "__main__":
 
     inv = mod_inverse(a, m)
     print(f"\nModular Inverse of {a} mod {m} = {inv}")
+
+    print(f"\nBatch inverses of [3, 6, 17, 0] mod 42 = {batch_mod_inverse([3, 6, 17, 0], 42)}")
+
+    if "--bench" in sys.argv:
+        benchmark_batch_inverse()
@@ -0,0 +1,426 @@
+import functools
+import math
+import random
+import sys
+import timeit
+
+# Shared integer arithmetic for the RSA, DSA, DH, CRT and Euclidean modules.
+# Everything here is iterative, so 2048-bit and larger operands never hit the recursion limit.
+
+LEHMER_THRESHOLD = 3072  # below this, plain Euclid is faster in pure Python
+LEHMER_DIGIT = 62        # leading bits used to simulate quotient steps with small integers
+
+
+# ------------------ GCD ------------------ #
+
+def binary_gcd(a, b):
+    """Stein's binary GCD: shifts and subtractions only."""
+    a, b = abs(a), abs(b)
+    if a == 0 or b == 0:
+        return a | b
+    shift = ((a | b) & -(a | b)).bit_length() - 1
+    a >>= (a & -a).bit_length() - 1
+    while b:
+        b >>= (b & -b).bit_length() - 1
+        if a > b:
+            a, b = b, a
+        b -= a
+    return a << shift
+
+def _lehmer_step(a, b):
+    """Cofactors (A, B, C, D) of the quotient steps predictable from the leading bits of a >= b."""
+    shift = max(a.bit_length() - LEHMER_DIGIT, 0)
+    ah, bh = a >> shift, b >> shift
+    A, B, C, D = 1, 0, 0, 1
+    while bh + C != 0 and bh + D != 0:
+        q = (ah + A) // (bh + C)
+        if q != (ah + B) // (bh + D):
+            break
+        A, B, C, D = C, D, A - q * C, B - q * D
+        ah, bh = bh, ah - q * bh
+    return A, B, C, D
+
+def lehmer_gcd(a, b):
+    """Lehmer's GCD: most Euclidean steps are done on 62-bit leading digits."""
+    a, b = abs(a), abs(b)
+    if a < b:
+        a, b = b, a
+    while b.bit_length() > LEHMER_DIGIT:
+        A, B, C, D = _lehmer_step(a, b)
+        if B == 0:
+            a, b = b, a % b
+        else:
+            a, b = A * a + B * b, C * a + D * b
+    while b:
+        a, b = b, a % b
+    return a
+
+def extended_gcd(a, b):
+    """Iterative extended Euclid: returns (g, x, y) with a*x + b*y = g = gcd(a, b).
+
+    Large operands switch to Lehmer's algorithm, which applies several quotient steps to
+    the full-size numbers at once.
+    """
+    if a < 0 or b < 0:
+        g, x, y = extended_gcd(abs(a), abs(b))
+        return g, (-x if a < 0 else x), (-y if b < 0 else y)
+    if a < b:
+        g, y, x = extended_gcd(b, a)
+        return g, x, y
+
+    # Invariants: a = x0*A0 + y0*B0, b = x1*A0 + y1*B0 for the original inputs A0, B0.
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    if b.bit_length() >= LEHMER_THRESHOLD:
+        while b.bit_length() > LEHMER_DIGIT:
+            A, B, C, D = _lehmer_step(a, b)
+            if B == 0:
+                q, r = divmod(a, b)
+                a, b = b, r
+                x0, x1 = x1, x0 - q * x1
+                y0, y1 = y1, y0 - q * y1
+            else:
+                a, b = A * a + B * b, C * a + D * b
+                x0, x1 = A * x0 + B * x1, C * x0 + D * x1
+                y0, y1 = A * y0 + B * y1, C * y0 + D * y1
+
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+def mod_inverse(a, m):
+    """Inverse of a modulo m; raises ValueError when gcd(a, m) != 1."""
+    g, x, _ = extended_gcd(a % m, m)
+    if g != 1:
+        raise ValueError(f"Modular inverse does not exist: gcd({a}, {m}) = {g}")
+    return x % m
+
+
+# ------------------ Modular exponentiation ------------------ #
+
+def _window_size(bits):
+    for limit, w in ((24, 1), (80, 3), (240, 4), (672, 5), (2048, 6)):
+        if bits <= limit:
+            return w
+    return 7
+
+def mod_pow(base, exp, mod, window=None):
+    """Sliding-window (base^exp) % mod: one multiplication per window of up to `window` bits.
+
+    Only odd powers base^1, base^3, ..., base^(2^window - 1) are precomputed; runs of zero
+    bits cost squarings only.
+    """
+    if mod == 1:
+        return 0
+    if exp < 0:
+        return mod_pow(mod_inverse(base, mod), -exp, mod, window)
+    base %= mod
+    bits = exp.bit_length()
+    w = window or _window_size(bits)
+
+    sq = base * base % mod
+    odd = [base]
+    for _ in range((1 << (w - 1)) - 1):
+        odd.append(odd[-1] * sq % mod)
+
+    result = 1
+    i = bits - 1
+    while i >= 0:
+        if not (exp >> i) & 1:
+            result = result * result % mod
+            i -= 1
+            continue
+        # Longest window exp[i..j] of at most w bits that ends in a 1 bit.
+        j = max(i - w + 1, 0)
+        while not (exp >> j) & 1:
+            j += 1
+        for _ in range(i - j + 1):
+            result = result * result % mod
+        result = result * odd[((exp >> j) & ((1 << (i - j + 1)) - 1)) >> 1] % mod
+        i = j - 1
+    return result
+
+
+# ------------------ Per-modulus contexts ------------------ #
+
+class ModContext:
+    """Arithmetic under one fixed modulus with its reduction constants computed once.
+
+    reduction="montgomery" keeps values in Montgomery form (x*R mod n, R = 2^k) and replaces
+    every division by REDC's two multiplications and a shift; it needs an odd modulus.
+    reduction="native" reduces with %, which on CPython is usually the faster of the two
+    because long division and multiplication run at similar speed. pow and multi_pow use
+    sliding-window recoding in either case.
+    """
+
+    def __init__(self, modulus, reduction="native"):
+        if modulus < 2:
+            raise ValueError("Modulus must be at least 2.")
+        if reduction not in ("native", "montgomery"):
+            raise ValueError(f"Unknown reduction {reduction!r}.")
+        if reduction == "montgomery" and modulus % 2 == 0:
+            raise ValueError("Montgomery reduction needs an odd modulus.")
+        self.n = modulus
+        self.reduction = reduction
+        if reduction == "montgomery":
+            self.k = modulus.bit_length()
+            self.mask = (1 << self.k) - 1
+            self.n_prime = (-mod_inverse(modulus, 1 << self.k)) & self.mask
+            self.r_mod_n = (1 << self.k) % modulus
+            self.r2_mod_n = (1 << (2 * self.k)) % modulus
+
+    def _redc(self, t):
+        u = (t + (((t & self.mask) * self.n_prime) & self.mask) * self.n) >> self.k
+        return u - self.n if u >= self.n else u
+
+    def _enter(self, x):
+        if self.reduction == "montgomery":
+            return self._redc((x % self.n) * self.r2_mod_n)
+        return x % self.n
+
+    def _leave(self, x):
+        return self._redc(x) if self.reduction == "montgomery" else x
+
+    def _mulmod(self):
+        if self.reduction == "montgomery":
+            return lambda a, b: self._redc(a * b)
+        n = self.n
+        return lambda a, b: a * b % n
+
+    def mul(self, a, b):
+        return a * b % self.n
+
+    def pow(self, base, exp, window=None):
+        """base^exp mod n using sliding windows over the exponent."""
+        if exp < 0:
+            return self.pow(mod_inverse(base, self.n), -exp, window)
+        mulmod = self._mulmod()
+        bits = exp.bit_length()
+        w = window or _window_size(bits)
+        b = self._enter(base)
+        one = self._enter(1)
+
+        sq = mulmod(b, b)
+        odd = [b]
+        for _ in range((1 << (w - 1)) - 1):
+            odd.append(mulmod(odd[-1], sq))
+
+        result = one
+        i = bits - 1
+        while i >= 0:
+            if not (exp >> i) & 1:
+                result = mulmod(result, result)
+                i -= 1
+                continue
+            j = max(i - w + 1, 0)
+            while not (exp >> j) & 1:
+                j += 1
+            for _ in range(i - j + 1):
+                result = mulmod(result, result)
+            result = mulmod(result, odd[((exp >> j) & ((1 << (i - j + 1)) - 1)) >> 1])
+            i = j - 1
+        return self._leave(result)
+
+    def multi_pow(self, pairs, window=4):
+        """Product of base^exp mod n over (base, exp) pairs, sharing one chain of squarings (Straus)."""
+        pairs = [(base, exp) if exp >= 0 else (mod_inverse(base, self.n), -exp) for base, exp in pairs]
+        mulmod = self._mulmod()
+        mask = (1 << window) - 1
+        tables = []
+        for base, _ in pairs:
+            b = self._enter(base)
+            table = [self._enter(1), b]
+            for _ in range(2, 1 << window):
+                table.append(mulmod(table[-1], b))
+            tables.append(table)
+
+        bits = max((exp.bit_length() for _, exp in pairs), default=0)
+        result = self._enter(1)
+        started = False
+        for shift in range(((bits + window - 1) // window - 1) * window, -1, -window):
+            if started:
+                for _ in range(window):
+                    result = mulmod(result, result)
+            for table, (_, exp) in zip(tables, pairs):
+                d = (exp >> shift) & mask
+                if d:
+                    result = mulmod(result, table[d])
+                    started = True
+        return self._leave(result)
+
+class FixedBaseTable:
+    """Precomputed powers of one base so base^e needs only about bits/window multiplications.
+
+    rows[i][d] holds base^(d * 2^(window*i)); an exponent is split into window-bit digits and
+    the matching entries are multiplied together with no squarings at all.
+    """
+
+    def __init__(self, base, mod, max_bits, window=8):
+        self.mod = mod
+        self.window = window
+        self.max_bits = max_bits
+        self.rows = []
+        b = base % mod
+        for _ in range((max_bits + window - 1) // window):
+            row = [1] * (1 << window)
+            for d in range(1, 1 << window):
+                row[d] = row[d - 1] * b % mod
+            self.rows.append(row)
+            b = row[-1] * b % mod
+        self.base = base % mod
+
+    def pow(self, exp):
+        if exp < 0 or exp.bit_length() > self.max_bits:
+            return pow(self.base, exp, self.mod)
+        mod, w, mask = self.mod, self.window, (1 << self.window) - 1
+        result = 1
+        for row in self.rows:
+            if not exp:
+                break
+            d = exp & mask
+            if d:
+                result = result * row[d] % mod
+            exp >>= w
+        return result
+
+@functools.lru_cache(maxsize=32)
+def context_for(modulus):
+    """Shared ModContext per modulus, so repeated callers reuse the precomputation."""
+    return ModContext(modulus)
+
+
+# ------------------ Primality ------------------ #
+
+def small_primes(limit):
+    """Odd primes below limit (sieve of Eratosthenes)."""
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i*i::i] = bytes(len(range(i*i, limit, i)))
+    return [i for i in range(3, limit) if sieve[i]]
+
+SMALL_PRIMES = small_primes(1 << 14)  # odd primes used for trial division and candidate sieves
+
+def miller_rabin(n, rounds=20, bases=None):
+    """Miller-Rabin on odd n > 3 with random bases, or the given ones; callers trial-divide first."""
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for a in bases or (random.randint(2, n - 2) for _ in range(rounds)):
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def is_probable_prime(n, rounds=40):
+    """Trial division by SMALL_PRIMES, then Miller-Rabin."""
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    for sp in SMALL_PRIMES:
+        if sp * sp > n:
+            return True
+        if n % sp == 0:
+            return n == sp
+    return miller_rabin(n, rounds)
+
+
+# ------------------ Benchmarks ------------------ #
+
+def _recursive_extended_gcd(a, b):
+    # The recursive version previously copy-pasted into 10.py, rsa.py, crt.py and euclidean.py.
+    if a == 0:
+        return b, 0, 1
+    g, x1, y1 = _recursive_extended_gcd(b % a, a)
+    return g, y1 - (b // a) * x1, x1
+
+def _square_and_multiply(base, exp, mod):
+    # The binary mod_pow previously duplicated in 10.py, rsa.py and dhkeyEX.py.
+    result = 1
+    base %= mod
+    while exp > 0:
+        if exp % 2 == 1:
+            result = (result * base) % mod
+        exp = exp >> 1
+        base = (base * base) % mod
+    return result
+
+def benchmark(bit_sizes=(256, 1024, 2048, 4096, 8192), number=10):
+    """Compares the inversion, GCD and exponentiation routines across operand sizes."""
+    def per_call(func):
+        return min(timeit.repeat(func, repeat=3, number=number)) / number * 1e6
+
+    for bits in bit_sizes:
+        m = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        a = random.getrandbits(bits) % m
+        while math.gcd(a, m) != 1:
+            a += 1
+        b = random.getrandbits(bits) | 1
+        expected = pow(a, -1, m)
+        assert mod_inverse(a, m) == expected
+        g, x, y = extended_gcd(a, m)
+        assert g == 1 and a * x + m * y == 1
+        assert binary_gcd(a * b, m * b) == lehmer_gcd(a * b, m * b) == math.gcd(a * b, m * b)
+        assert mod_pow(a, m, m + 2) == pow(a, m, m + 2)
+
+        print(f"\n--- {bits}-bit operands (us per call) ---")
+        try:
+            recursive = f"{per_call(lambda: _recursive_extended_gcd(a, m)):10.1f}"
+        except RecursionError:
+            recursive = "RecursionError"
+        print(f"recursive extended_gcd : {recursive:>10}")
+        print(f"extended_gcd           : {per_call(lambda: extended_gcd(a, m)):10.1f}")
+        print(f"pow(a, -1, m)          : {per_call(lambda: pow(a, -1, m)):10.1f}")
+        print(f"binary_gcd             : {per_call(lambda: binary_gcd(a, m)):10.1f}")
+        print(f"lehmer_gcd             : {per_call(lambda: lehmer_gcd(a, m)):10.1f}")
+        print(f"math.gcd               : {per_call(lambda: math.gcd(a, m)):10.1f}")
+        print(f"square-and-multiply    : {per_call(lambda: _square_and_multiply(a, m, m + 2)):10.1f}")
+        print(f"mod_pow (sliding)      : {per_call(lambda: mod_pow(a, m, m + 2)):10.1f}")
+        print(f"pow(a, e, m)           : {per_call(lambda: pow(a, m, m + 2)):10.1f}")
+
+
+def benchmark_contexts(bit_sizes=(512, 1024, 2048, 3072), number=3):
+    """ModContext pow/multi_pow against mod_pow and the built-in pow across modulus sizes."""
+    def per_call(func):
+        return min(timeit.repeat(func, repeat=3, number=number)) / number * 1e3
+
+    for bits in bit_sizes:
+        n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        a, b = random.randrange(2, n), random.randrange(2, n)
+        e1, e2 = random.getrandbits(bits), random.getrandbits(bits)
+        native, mont = ModContext(n), ModContext(n, "montgomery")
+        expected = pow(a, e1, n) * pow(b, e2, n) % n
+        assert native.pow(a, e1) == mont.pow(a, e1) == pow(a, e1, n)
+        assert native.multi_pow([(a, e1), (b, e2)]) == mont.multi_pow([(a, e1), (b, e2)]) == expected
+
+        print(f"\n--- {bits}-bit modulus, full-size exponents (ms per call) ---")
+        print(f"square-and-multiply          : {per_call(lambda: _square_and_multiply(a, e1, n)):8.2f}")
+        print(f"mod_pow                      : {per_call(lambda: mod_pow(a, e1, n)):8.2f}")
+        print(f"pow                          : {per_call(lambda: pow(a, e1, n)):8.2f}")
+        print(f"ModContext.pow (native)      : {per_call(lambda: native.pow(a, e1)):8.2f}")
+        print(f"ModContext.pow (montgomery)  : {per_call(lambda: mont.pow(a, e1)):8.2f}")
+        print(f"two pows + mul               : {per_call(lambda: pow(a, e1, n) * pow(b, e2, n) % n):8.2f}")
+        print(f"ModContext.multi_pow         : {per_call(lambda: native.multi_pow([(a, e1), (b, e2)])):8.2f}")
+
+
+if __name__ == "__main__":
+    a, m = 17, 43
+    g, x, y = extended_gcd(a, m)
+    print(f"extended_gcd({a}, {m}) = {g}, x = {x}, y = {y}")
+    print(f"mod_inverse({a}, {m}) = {mod_inverse(a, m)}")
+    print(f"mod_pow(5, 117, 19) = {mod_pow(5, 117, 19)}")
+
+    if "--bench" in sys.argv:
+        benchmark()
+        benchmark_contexts()
@@ -1,3 +1,9 @@
+import functools
+import sys
+import time
+
+import numpy as np
+
 # 1. Rail Fence Cipher
 def rail_fence_encrypt(text, key):
     rail = [['\n' for i in range(len(text))]
@@ -73,6 +79,118 @@ def rail_fence_decrypt(cipher, key):
     return ("".join(result))
 
 
+# Permutation-based rail fence: O(n) time and memory, independent of the number of rails.
+# Permutations up to PERMUTATION_CACHE_LIMIT positions are cached (at most 16 x 2 x 4 MiB);
+# longer ones are rebuilt per call so large unsegmented inputs do not stay pinned in memory.
+PERMUTATION_CACHE_LIMIT = 1 << 20
+
+def rail_fence_permutation(length, key):
+    """(encrypt_index, decrypt_index) gather arrays for one (length, key).
+
+    cipher = text[encrypt_index] and text = cipher[decrypt_index].
+    """
+    if length <= PERMUTATION_CACHE_LIMIT:
+        return _cached_permutation(length, key)
+    return _build_permutation(length, key)
+
+@functools.lru_cache(maxsize=16)
+def _cached_permutation(length, key):
+    return _build_permutation(length, key)
+
+def _build_permutation(length, key):
+    """Position i sits on rail min(m, cycle - m) with m = i mod cycle; its place in the
+    ciphertext is the rail's offset plus how many earlier positions share the rail, which
+    follows directly from i // cycle.
+    """
+    dtype = np.int32 if length < (1 << 31) else np.int64
+    i = np.arange(length, dtype=dtype)
+    if key <= 1 or length <= 1:
+        i.flags.writeable = False
+        return i, i
+    cycle = 2 * (key - 1)
+    m = i % cycle
+    rails = np.minimum(m, cycle - m)
+    edge = (rails == 0) | (rails == key - 1)
+    rank = (i // cycle) * np.where(edge, 1, 2) + (m >= key)  # middle rails are hit twice per cycle
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(rails, minlength=key))[:-1])).astype(dtype)
+    decrypt_index = offsets[rails] + rank
+    encrypt_index = np.empty_like(decrypt_index)
+    encrypt_index[decrypt_index] = i
+    encrypt_index.flags.writeable = decrypt_index.flags.writeable = False
+    return encrypt_index, decrypt_index
+
+def _rail_fence_apply(data, key, segment_length, which):
+    """Gathers str or bytes data through the cached permutation, segment by segment."""
+    if isinstance(data, str):
+        if data.isascii():
+            codes = np.frombuffer(data.encode('ascii'), dtype=np.uint8)
+            decode = lambda out: out.tobytes().decode('ascii')
+        else:
+            codes = np.frombuffer(data.encode('utf-32-le'), dtype=np.uint32)
+            decode = lambda out: out.tobytes().decode('utf-32-le')
+    else:
+        codes = np.frombuffer(data, dtype=np.uint8)
+        decode = lambda out: out.tobytes()
+
+    n = len(codes)
+    seg = segment_length or n
+    full = n - n % seg if seg else 0
+    out = np.empty_like(codes)
+    if full:
+        index = rail_fence_permutation(seg, key)[which]
+        np.take(codes[:full].reshape(-1, seg), index, axis=1, out=out[:full].reshape(-1, seg))
+    if full < n:
+        out[full:] = codes[full:][rail_fence_permutation(n - full, key)[which]]
+    return decode(out)
+
+def rail_fence_encrypt_fast(text, key, segment_length=None):
+    """rail_fence_encrypt as a single gather; text may be str or bytes.
+
+    With segment_length set, the text is cut into independent segments of that length (the
+    last one may be shorter), each encrypted as rail_fence_encrypt would encrypt it alone; this
+    bounds the permutation size for very long inputs and keeps it cacheable.
+    """
+    return _rail_fence_apply(text, key, segment_length, 0)
+
+def rail_fence_decrypt_fast(cipher, key, segment_length=None):
+    return _rail_fence_apply(cipher, key, segment_length, 1)
+
+
+def benchmark_rail_fence(keys=(2, 10, 100, 1000), grid_length=20000, sizes_mb=(1, 10, 100), segment_length=1 << 20):
+    """Grid implementation against the permutation version, then the permutation version on large inputs."""
+    text = ("WE ARE DISCOVERED FLEE AT ONCE " * (grid_length // 30 + 1))[:grid_length]
+    print(f"\n--- Rail fence: grid vs permutation ({grid_length} chars) ---")
+    for key in keys:
+        start = time.perf_counter()
+        expected = rail_fence_encrypt(text, key)
+        grid = time.perf_counter() - start
+        _cached_permutation.cache_clear()
+        start = time.perf_counter()
+        result = rail_fence_encrypt_fast(text, key)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        rail_fence_encrypt_fast(text, key)
+        warm = time.perf_counter() - start
+        assert result == expected and rail_fence_decrypt_fast(result, key) == text
+        print(f"key = {key:>4d}: grid {grid * 1e3:9.2f} ms | permutation {cold * 1e3:7.3f} ms (cached {warm * 1e3:7.3f} ms)")
+
+    print(f"\n--- Rail fence permutation on large inputs (MB/s encrypt / decrypt, {segment_length >> 10} KiB segments) ---")
+    block = (b"WE ARE DISCOVERED FLEE AT ONCE " * ((1 << 20) // 30 + 1))[:1 << 20]
+    for mb in sizes_mb:
+        data = block * mb
+        cells = []
+        for key in keys:
+            start = time.perf_counter()
+            enc = rail_fence_encrypt_fast(data, key, segment_length)
+            mid = time.perf_counter()
+            dec = rail_fence_decrypt_fast(enc, key, segment_length)
+            end = time.perf_counter()
+            assert dec == data
+            cells.append(f"key {key}: {len(data) / (mid - start) / 1e6:6.0f} / {len(data) / (end - mid) / 1e6:6.0f}")
+            del enc, dec
+        print(f"{mb:>4d} MB | " + " | ".join(cells))
+
+
 
 # 2. Row & Column Transposition Cipher
 import math
@@ -128,6 +246,7 @@ if __name__ == "__main__":
     print("Original Message:", message)
     print("Encrypted Message:", encrypted_rf)
     print("Decrypted Message:", decrypted_rf)
+    print("Permutation version:", rail_fence_encrypt_fast(message, key_rf), rail_fence_decrypt_fast(encrypted_rf, key_rf))
 
     # Row Column Cipher Example
     message2 = "WEAREDISCOVERED"
@@ -139,3 +258,6 @@ if __name__ == "__main__":
     print("Original Message:", message2)
     print("Encrypted Message:", encrypted_rc)
     print("Decrypted Message:", decrypted_rc)
+
+    if "--bench" in sys.argv:
+        benchmark_rail_fence()
@@ -1,18 +1,16 @@
+import collections
+import concurrent.futures
+import itertools
 import random
 import math
+import sys
+import time
+import timeit
 
-# --- Primality Testing (Miller-Rabin for Speed) ---
+import numtheory
+from numtheory import SMALL_PRIMES, ModContext, miller_rabin
 
-def mod_pow(base, exp, mod):
-    """Computes (base^exp) % mod efficiently."""
-    result = 1
-    base %= mod
-    while exp > 0:
-        if exp % 2 == 1:
-            result = (result * base) % mod
-        exp = exp >> 1
-        base = (base * base) % mod
-    return result
+# --- Primality Testing (Miller-Rabin for Speed) ---
 
 def is_prime(n, k=20):
     """Probabilistic primality test (Miller-Rabin)."""
@@ -28,16 +26,17 @@ def is_prime(n, k=20):
         d //= 2
         r += 1
 
-    # Witness Loop
+    # Witness Loop (all witnesses share one context for the modulus n)
+    ctx = ModContext(n)
     for _ in range(k):
         a = random.randint(2, n - 2)
-        x = mod_pow(a, d, n)
+        x = ctx.pow(a, d)
         if x == 1 or x == n - 1:
             continue
         
         composite = True
         for _ in range(r - 1):
-            x = mod_pow(x, 2, n)
+            x = ctx.mul(x, x)
             if x == n - 1:
                 composite = False
                 break
@@ -45,32 +44,59 @@ def is_prime(n, k=20):
             return False
     return True
 
-def generate_prime(bits):
-    """Generates a large prime number with the specified number of bits."""
+def generate_prime(bits, top_bits=1):
+    """Generates a large prime number with the specified number of bits (the top_bits highest set)."""
     while True:
         # Generate a random odd number of the required size
-        num = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        num = random.getrandbits(bits) | _top_mask(bits, top_bits) | 1
         if is_prime(num):
             return num
 
-# --- Extended Euclidean Algorithm ---
+# --- Sieved Incremental Prime Search ---
+
+SIEVE_WINDOW = 4096  # odd candidates examined per random starting point
+
+def _top_mask(bits, top_bits):
+    return ((1 << top_bits) - 1) << (bits - top_bits)
 
-def extended_gcd(a, b):
-    if a == 0:
-        return b, 0, 1
-    gcd, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return gcd, x, y
+def generate_prime_sieved(bits, window=SIEVE_WINDOW, top_bits=1):
+    """Generates a prime by sieving a window of consecutive odd candidates with small primes.
+
+    Candidates base, base + 2, ... share one residue computation per small prime, so only the
+    survivors (about 1 in 9 odd candidates) reach Miller-Rabin.
+    """
+    if bits < 32:
+        return generate_prime(bits, top_bits)
+    while True:
+        base = random.getrandbits(bits) | _top_mask(bits, top_bits) | 1
+        sieve = bytearray([1]) * window
+        for sp in SMALL_PRIMES:
+            # base + 2i = 0 (mod sp)  <=>  i = -base * 2^-1 (mod sp)
+            start = (-(base % sp) * ((sp + 1) // 2)) % sp
+            sieve[start::sp] = bytes(len(range(start, window, sp)))
+        for i in itertools.compress(range(window), sieve):
+            candidate = base + 2 * i
+            if candidate.bit_length() != bits:
+                break
+            if miller_rabin(candidate):
+                return candidate
+
+def _generate_rsa_prime(bits, e, top_bits=1):
+    """Sieved prime p with gcd(e, p - 1) = 1, so e stays invertible."""
+    while True:
+        prime = generate_prime_sieved(bits, top_bits=top_bits)
+        if math.gcd(e, prime - 1) == 1:
+            return prime
+
+# --- Extended Euclidean Algorithm ---
 
 def mod_inverse(e, phi):
     """Calculates modular inverse (d) using Extended Euclidean Algorithm."""
-    gcd, x, _ = extended_gcd(e, phi)
-    if gcd != 1:
+    try:
+        return numtheory.mod_inverse(e, phi)
+    except ValueError:
         # Inverse exists only if gcd(e, phi) = 1
-        return None 
-    # Ensure result is positive
-    return x % phi
+        return None
 
 # --- RSA Core Functions ---
 
@@ -104,9 +130,148 @@ def encrypt(plaintext, public_key):
 
 def decrypt(ciphertext, private_key):
     """Decrypts the integer ciphertext M = C^d mod n."""
+    if isinstance(private_key, RSAPrivateKey):
+        return decrypt_crt(ciphertext, private_key)
     d, n = private_key
     return pow(ciphertext, d, n)
 
+# --- CRT Private Keys (PKCS #1 / RFC 8017 representation) ---
+
+RSAPrivateKey = collections.namedtuple(
+    "RSAPrivateKey", ["n", "e", "d", "p", "q", "dP", "dQ", "qInv", "other_primes"]
+)
+RSAPrivateKey.__doc__ = """RSA private key keeping the factors and CRT exponents.
+
+other_primes holds (r_i, d_i, t_i) triples for multi-prime keys: d_i = d mod (r_i - 1) and
+t_i is the inverse of p * q * r_3 * ... * r_(i-1) modulo r_i.
+"""
+
+def generate_crt_keys(key_size, num_primes=2, e=65537):
+    """Generates an RSA key pair whose private half keeps the primes for CRT decryption."""
+    if not 2 <= num_primes <= 4:
+        raise ValueError("Only 2-, 3- and 4-prime RSA keys are supported.")
+
+    top_bits = _TOP_BITS[num_primes]
+    primes = [_generate_rsa_prime(bits, e, top_bits) for bits in _prime_sizes(key_size, num_primes)]
+    return _finish_keys(primes, e, top_bits)
+
+def generate_keys_parallel(key_size, num_primes=2, e=65537, workers=None, executor=None):
+    """Same as generate_crt_keys, but the primes are searched concurrently on a process pool.
+
+    executor defaults to a module-level pool that is kept between calls.
+    """
+    if not 2 <= num_primes <= 4:
+        raise ValueError("Only 2-, 3- and 4-prime RSA keys are supported.")
+    top_bits = _TOP_BITS[num_primes]
+    sizes = _prime_sizes(key_size, num_primes)
+    pool = executor or _executor(workers)
+    primes = list(pool.map(_generate_rsa_prime, sizes, [e] * num_primes, [top_bits] * num_primes))
+    return _finish_keys(primes, e, top_bits)
+
+# Highest bits set in every prime so the product of num_primes of them never comes up a bit short:
+# (1 - 2^-top_bits)^num_primes >= 1/2.
+_TOP_BITS = {2: 2, 3: 3, 4: 3}
+
+_POOL = None
+_POOL_WORKERS = None
+
+def _executor(workers):
+    """Process pool kept for the lifetime of the module, replaced only when workers changes."""
+    global _POOL, _POOL_WORKERS
+    if _POOL is None or _POOL_WORKERS != workers:
+        if _POOL is not None:
+            _POOL.shutdown()
+        # Forked workers inherit the parent's PRNG state, so every worker reseeds from the OS first.
+        _POOL = concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=random.seed)
+        _POOL_WORKERS = workers
+    return _POOL
+
+def _prime_sizes(key_size, num_primes):
+    return [key_size // num_primes + (1 if i < key_size % num_primes else 0) for i in range(num_primes)]
+
+def _finish_keys(primes, e, top_bits):
+    # A repeated prime is only possible for toy key sizes; replace just the duplicate.
+    for i in range(1, len(primes)):
+        while primes[i] in primes[:i]:
+            primes[i] = _generate_rsa_prime(primes[i].bit_length(), e, top_bits)
+    return (e, math.prod(primes)), _build_private_key(primes, e)
+
+def _build_private_key(primes, e):
+    n = math.prod(primes)
+    p, q, *others = primes
+    lam = math.lcm(*(r - 1 for r in primes))
+    d = mod_inverse(e, lam)
+
+    other_primes = []
+    product = p * q
+    for r in others:
+        other_primes.append((r, d % (r - 1), mod_inverse(product % r, r)))
+        product *= r
+
+    return RSAPrivateKey(n, e, d, p, q, d % (p - 1), d % (q - 1), mod_inverse(q, p), tuple(other_primes))
+
+def decrypt_crt(ciphertext, private_key):
+    """Decrypts with the CRT exponents and Garner recombination (same result as pow(c, d, n))."""
+    k = private_key
+    m1 = pow(ciphertext, k.dP, k.p)
+    m2 = pow(ciphertext, k.dQ, k.q)
+    h = k.qInv * (m1 - m2) % k.p
+    m = m2 + h * k.q
+
+    product = k.p * k.q
+    for r, d_r, t_r in k.other_primes:
+        m_r = pow(ciphertext, d_r, r)
+        h = (m_r - m) * t_r % r
+        m += product * h
+        product *= r
+    return m
+
+def sign(message, private_key):
+    """Raw RSA signature S = M^d mod n (uses CRT when given an RSAPrivateKey)."""
+    return decrypt(message, private_key)
+
+def verify(signature, message, public_key):
+    return encrypt(signature, public_key) == message
+
+# --- Benchmarks ---
+
+def benchmark_crt(key_sizes=(2048, 4096), rounds=20):
+    """Compares plain decrypt with CRT decryption for 2-, 3- and 4-prime keys."""
+    for key_size in key_sizes:
+        print(f"\n--- RSA decryption benchmark ({key_size} bits) ---")
+        baseline = None
+        for num_primes in (2, 3, 4):
+            public_key, private_key = generate_crt_keys(key_size, num_primes)
+            message = random.randrange(2, private_key.n - 1)
+            ciphertext = encrypt(message, public_key)
+            assert decrypt(ciphertext, private_key) == message
+            assert verify(sign(message, private_key), message, public_key)
+
+            if baseline is None:
+                plain_key = (private_key.d, private_key.n)
+                assert decrypt(ciphertext, plain_key) == message
+                baseline = min(timeit.repeat(lambda: decrypt(ciphertext, plain_key), repeat=3, number=rounds)) / rounds
+                print(f"decrypt (d, n)         : {baseline * 1e3:8.2f} ms")
+            crt = min(timeit.repeat(lambda: decrypt(ciphertext, private_key), repeat=3, number=rounds)) / rounds
+            print(f"decrypt CRT, {num_primes} primes  : {crt * 1e3:8.2f} ms  ({baseline / crt:4.1f}x)")
+
+def benchmark_keygen(key_sizes=(2048, 4096), count=3, workers=None):
+    """Keys/min of generate_keys against the sieved serial and parallel generators."""
+    for key_size in key_sizes:
+        print(f"\n--- RSA key generation benchmark ({key_size} bits, {count} keys) ---")
+        for name, func in (
+            ("generate_keys", lambda: generate_keys(key_size)),
+            ("generate_crt_keys (sieved)", lambda: generate_crt_keys(key_size)),
+            ("generate_keys_parallel", lambda: generate_keys_parallel(key_size, workers=workers)),
+        ):
+            start = time.perf_counter()
+            for _ in range(count):
+                public_key, private_key = func()
+                assert decrypt(encrypt(42, public_key), private_key) == 42
+            elapsed = time.perf_counter() - start
+            print(f"{name:<27}: {count * 60 / elapsed:8.2f} keys/min")
+
+
 # --- Execution ---
 
 if __name__ == "__main__":
@@ -133,4 +298,8 @@ if __name__ == "__main__":
     print(f"Encrypted Ciphertext: {encrypted}")
     print(f"Decrypted Message: {decrypted}")
     print("-" * 40)
-    print(f"Verification Success: {MESSAGE == decrypted}")
\ No newline at end of file
+    print(f"Verification Success: {MESSAGE == decrypted}")
+
+    if "--bench" in sys.argv:
+        benchmark_crt()
+        benchmark_keygen()
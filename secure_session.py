@@ -0,0 +1,353 @@
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import os
+import struct
+import sys
+import time
+
+from aes import AESGCM
+from dhkeyEX import DHGroup, GROUPS, register_worker_group, worker_group
+
+# Diffie-Hellman handshake followed by AES-GCM encrypted payloads over asyncio TCP streams.
+#
+# Client -> server: b"H" + id length + peer id + client public key   (full handshake)
+#                   b"R" + id length + peer id                       (resume with a cached key)
+# Server -> client: b"K" + server public key | b"R" (resumed) | b"N" (no cached key, handshake)
+# Then each data frame is nonce (12) + ciphertext + tag (16) in both directions; an empty
+# frame closes the session.
+
+
+# ------------------ Framing ------------------ #
+
+class LengthPrefixFraming:
+    """Frames carried as a 4-byte big-endian length followed by the payload."""
+
+    max_frame = 1 << 24
+
+    async def read_frame(self, reader):
+        try:
+            header = await reader.readexactly(4)
+        except asyncio.IncompleteReadError:
+            return None
+        (length,) = struct.unpack('>I', header)
+        if length > self.max_frame:
+            raise ValueError(f"Frame of {length} bytes exceeds the {self.max_frame}-byte limit.")
+        return await reader.readexactly(length)
+
+    def write_frame(self, writer, payload):
+        writer.write(struct.pack('>I', len(payload)) + payload)
+
+
+class NetstringFraming:
+    """Frames carried as netstrings: b"<decimal length>:" + payload + b","."""
+
+    max_frame = 1 << 24
+
+    async def read_frame(self, reader):
+        try:
+            header = await reader.readuntil(b":")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise ValueError("Netstring length header is too long.") from None
+        length = int(header[:-1])
+        if length > self.max_frame:
+            raise ValueError(f"Frame of {length} bytes exceeds the {self.max_frame}-byte limit.")
+        payload = await reader.readexactly(length + 1)
+        if payload[-1:] != b",":
+            raise ValueError("Malformed netstring frame.")
+        return payload[:-1]
+
+    def write_frame(self, writer, payload):
+        writer.write(str(len(payload)).encode() + b":" + payload + b",")
+
+
+FRAMINGS = {"length": LengthPrefixFraming, "netstring": NetstringFraming}
+
+
+# ------------------ Handshake work (runs in worker processes) ------------------ #
+
+def derive_session_key(shared, client_public, server_public, p):
+    size = (p.bit_length() + 7) // 8
+    material = b"session" + shared.to_bytes(size, 'big') + client_public + server_public
+    return hashlib.sha256(material).digest()[:16]
+
+def _server_handshake(spec, client_public):
+    group = worker_group(spec)
+    size = (group.p.bit_length() + 7) // 8
+    peer = int.from_bytes(client_public, 'big')
+    b, B = group.generate_keypair()
+    server_public = B.to_bytes(size, 'big')
+    return server_public, derive_session_key(group.shared_secret(b, peer), client_public, server_public, group.p)
+
+def _client_keypair(spec):
+    group = worker_group(spec)
+    size = (group.p.bit_length() + 7) // 8
+    a, A = group.generate_keypair()
+    return a, A.to_bytes(size, 'big')
+
+def _client_finish(spec, private_key, client_public, server_public):
+    group = worker_group(spec)
+    shared = group.shared_secret(private_key, int.from_bytes(server_public, 'big'))
+    return derive_session_key(shared, client_public, server_public, group.p)
+
+
+def _seal(gcm, plaintext):
+    nonce = os.urandom(12)
+    ciphertext, tag = gcm.encrypt(nonce, plaintext)
+    return nonce + ciphertext + tag
+
+def _open(gcm, frame):
+    if len(frame) < 28:
+        raise ValueError("Encrypted frame is shorter than its nonce and tag.")
+    return gcm.decrypt(frame[:12], frame[12:-16], frame[-16:])
+
+
+# ------------------ Server ------------------ #
+
+def _parse_hello(frame, kinds):
+    """(kind, peer id, client public key) from a handshake frame; ValueError if malformed."""
+    if len(frame) < 2 or frame[:1] not in kinds:
+        raise ValueError("Malformed handshake frame.")
+    end = 2 + frame[1]
+    if len(frame) < end:
+        raise ValueError("Handshake frame is shorter than its peer id.")
+    return frame[:1], frame[2:end], frame[end:]
+
+class SessionServer:
+    """Asyncio TCP server; DH handshakes run on a process pool so the event loop stays free.
+
+    Session keys are cached per peer id (LRU, cache_size entries), so a returning peer can
+    resume without a new exchange.
+    """
+
+    def __init__(self, group, framing=None, pool=None, workers=None, cache_size=4096):
+        self.group = group
+        self.spec = group.spec
+        self.framing = framing or LengthPrefixFraming()
+        self.pool = pool
+        self.workers = workers
+        self.cache_size = cache_size
+        self.sessions = collections.OrderedDict()
+        self.handshakes = 0
+        self.resumes = 0
+        self.bytes_received = 0
+        self._server = None
+        self._own_pool = False
+
+    async def start(self, host="127.0.0.1", port=0):
+        if self.pool is None:
+            register_worker_group(self.group)
+            self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+            self._own_pool = True
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._own_pool:
+            self.pool.shutdown()
+
+    def _remember(self, peer_id, key):
+        self.sessions[peer_id] = key
+        self.sessions.move_to_end(peer_id)
+        while len(self.sessions) > self.cache_size:
+            self.sessions.popitem(last=False)
+
+    async def _handshake(self, reader, writer):
+        frame = await self.framing.read_frame(reader)
+        if frame is None:
+            return None
+        kind, peer_id, client_public = _parse_hello(frame, (b"H", b"R"))
+
+        if kind == b"R":
+            key = self.sessions.get(peer_id)
+            if key is not None:
+                self.sessions.move_to_end(peer_id)
+                self.resumes += 1
+                self.framing.write_frame(writer, b"R")
+                return key
+            self.framing.write_frame(writer, b"N")
+            frame = await self.framing.read_frame(reader)
+            if frame is None:
+                return None
+            _, peer_id, client_public = _parse_hello(frame, (b"H",))
+
+        self.group.check_public_key(int.from_bytes(client_public, 'big'))
+        loop = asyncio.get_running_loop()
+        server_public, key = await loop.run_in_executor(self.pool, _server_handshake, self.spec, client_public)
+        self.framing.write_frame(writer, b"K" + server_public)
+        self._remember(peer_id, key)
+        self.handshakes += 1
+        return key
+
+    async def _handle(self, reader, writer):
+        try:
+            key = await self._handshake(reader, writer)
+            if key is None:
+                return
+            gcm = AESGCM(key)
+            while True:
+                frame = await self.framing.read_frame(reader)
+                if not frame:
+                    break
+                payload = _open(gcm, frame)
+                self.bytes_received += len(payload)
+                self.framing.write_frame(writer, _seal(gcm, struct.pack('>Q', len(payload))))
+                await writer.drain()
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+# ------------------ Client ------------------ #
+
+class SessionClient:
+    """Client side of the protocol; keeps its own per-server session key for resumption."""
+
+    def __init__(self, group, peer_id, framing=None, pool=None):
+        self.spec = group.spec
+        self.peer_id = peer_id
+        self.framing = framing or LengthPrefixFraming()
+        self.pool = pool
+        self.key = None
+        self.gcm = None
+        self.reader = self.writer = None
+
+    async def connect(self, host, port):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        hello = bytes([len(self.peer_id)]) + self.peer_id
+        if self.key is not None:
+            self.framing.write_frame(self.writer, b"R" + hello)
+            reply = await self.framing.read_frame(self.reader)
+            if reply == b"R":
+                return False
+        loop = asyncio.get_running_loop()
+        private_key, client_public = await loop.run_in_executor(self.pool, _client_keypair, self.spec)
+        self.framing.write_frame(self.writer, b"H" + hello + client_public)
+        reply = await self.framing.read_frame(self.reader)
+        if not reply or reply[:1] != b"K":
+            raise ConnectionError("Handshake rejected by server.")
+        self.key = await loop.run_in_executor(self.pool, _client_finish, self.spec, private_key, client_public, reply[1:])
+        self.gcm = AESGCM(self.key)
+        return True
+
+    async def send(self, payload):
+        """Sends one encrypted payload and waits for the server's encrypted acknowledgement."""
+        self.framing.write_frame(self.writer, _seal(self.gcm, payload))
+        await self.writer.drain()
+        ack = await self.framing.read_frame(self.reader)
+        (received,) = struct.unpack('>Q', _open(self.gcm, ack))
+        return received
+
+    async def close(self):
+        if self.writer is not None:
+            self.framing.write_frame(self.writer, b"")
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.writer = None
+
+
+# ------------------ Load generator ------------------ #
+
+def _percentiles(samples):
+    if not samples:
+        return (0.0, 0.0, 0.0)
+    s = sorted(samples)
+    return tuple(s[min(len(s) - 1, int(len(s) * q))] for q in (0.5, 0.95, 0.99))
+
+async def run_load(group, concurrency, clients, payloads=4, payload_size=4096, framing="length",
+                   resume=True, workers=None):
+    """Drives `clients` sessions, at most `concurrency` at a time, against a local server.
+
+    Each client performs a handshake, sends `payloads` encrypted payloads and, when resume is
+    set, reconnects once with its cached session key. Returns a dict of throughput and latency.
+    """
+    register_worker_group(group)  # forked workers inherit the group's table
+    pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    server = SessionServer(group, FRAMINGS[framing](), pool=pool)
+    host, port = await server.start()
+    gate = asyncio.Semaphore(concurrency)
+    handshake_latency, payload_latency = [], []
+    data = os.urandom(payload_size)
+
+    async def one_client(i):
+        async with gate:
+            client = SessionClient(group, f"peer-{i}".encode(), FRAMINGS[framing](), pool=pool)
+            for _ in range(2 if resume else 1):
+                start = time.perf_counter()
+                await client.connect(host, port)
+                handshake_latency.append(time.perf_counter() - start)
+                for _ in range(payloads):
+                    start = time.perf_counter()
+                    assert await client.send(data) == payload_size
+                    payload_latency.append(time.perf_counter() - start)
+                await client.close()
+
+    # Warm the worker processes so table construction is not counted as handshake latency.
+    await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(pool, _client_keypair, group.spec)
+                           for _ in range(workers or os.cpu_count() or 1)))
+    start = time.perf_counter()
+    await asyncio.gather(*(one_client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    await server.close()
+    pool.shutdown()
+
+    return {
+        "concurrency": concurrency,
+        "handshakes_per_s": server.handshakes / elapsed,
+        "resumes": server.resumes,
+        "payload_mb_per_s": server.bytes_received / elapsed / 1e6,
+        "handshake_ms": tuple(x * 1e3 for x in _percentiles(handshake_latency)),
+        "payload_ms": tuple(x * 1e3 for x in _percentiles(payload_latency)),
+    }
+
+def benchmark(group_name="ffdhe2048", levels=(1, 4, 16), clients=16, payloads=4, payload_size=4096,
+              framing="length"):
+    group = DHGroup.named(group_name)
+    print(f"\n--- Session load test ({group_name}, {clients} clients, {payloads} x {payload_size} B payloads, "
+          f"{framing} framing) ---")
+    for level in levels:
+        r = asyncio.run(run_load(group, level, clients, payloads, payload_size, framing))
+        print(f"concurrency {r['concurrency']:>3d}: {r['handshakes_per_s']:7.1f} handshakes/s, "
+              f"{r['payload_mb_per_s']:6.3f} MB/s, resumed {r['resumes']:>3d} | "
+              "handshake p50/p95/p99 {:.1f}/{:.1f}/{:.1f} ms | payload p50/p95/p99 {:.1f}/{:.1f}/{:.1f} ms".format(
+                  *r['handshake_ms'], *r['payload_ms']))
+
+
+async def check_malformed_frames():
+    """Truncated or malformed frames must close the connection without an unhandled exception."""
+    loop = asyncio.get_running_loop()
+    errors = []
+    loop.set_exception_handler(lambda _, context: errors.append(context))
+    cases = [b"H", b"R", b"X", b"H\x05ab", b"R\x09peer", b"H\x00", b"H\x02id"]
+    for name, framing_cls in FRAMINGS.items():
+        server = SessionServer(DHGroup(23, 5, exponent_bits=4), framing_cls(), workers=1)
+        host, port = await server.start()
+        raw = [b"9" * (1 << 17)] if name == "netstring" else []  # header beyond the stream limit
+        for frame in cases + raw:
+            reader, writer = await asyncio.open_connection(host, port)
+            if frame in raw:
+                writer.write(frame)
+            else:
+                framing_cls().write_frame(writer, frame)
+            try:
+                assert await asyncio.wait_for(reader.read(), 5) == b"", (name, frame)
+            except ConnectionResetError:
+                pass  # closed with unread input still buffered; still a clean rejection
+            writer.close()
+        await server.close()
+    assert not errors, errors
+    print(f"Malformed frames: {len(cases)} cases x {len(FRAMINGS)} framings rejected cleanly")
+
+
+if __name__ == "__main__":
+    asyncio.run(check_malformed_frames())
+    framing = "netstring" if "--netstring" in sys.argv else "length"
+    group_name = next((a for a in sys.argv[1:] if a in GROUPS), "ffdhe2048")
+    benchmark(group_name, framing=framing)